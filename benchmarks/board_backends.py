@@ -0,0 +1,89 @@
+import argparse
+import time
+
+import chess
+from board import BACKENDS
+from pieces import King, Queen, Rook, Bishop, Knight, Pawn
+from utils import Move
+
+"""
+Compares the board backends.
+Replays a game and at every position,
+- generates the pseudo-legal moves of each piece of the player to move.
+- generates all the legal moves of the player to move (Refer `Chess.legal_moves`, from the pin and check masks).
+- generates all the legal moves of the player to move by applying each pseudo-legal move
+  and testing for check (mostly making and undoing moves).
+- queries the pieces of each player and of each piece type.
+Each is timed a few rounds (alternating the backends) and the best round is reported.
+
+Run from the project root using
+python -m benchmarks.board_backends
+"""
+
+# The immortal game (Anderssen vs Kieseritzky, 1851)
+GAME = 'e4 e5 f4 exf4 Bc4 Qh4+ Kf1 b5 Bxb5 Nf6 Nf3 Qh6 d3 Nh5 Nh4 Qg5 Nf5 c6 g4 Nf6 Rg1 cxb5 h4 Qg6 h5 Qg5 Qf3 Ng8 ' \
+	   'Bxf4 Qf6 Nc3 Bc5 Nd5 Qxb2 Bd6 Bxg1 e5 Qxa1+ Ke2 Na6 Nxg7+ Kd8 Qf6+ Nxf6 Be7#'.split()
+
+
+def pseudo_legal_moves(chess_instance):
+	return sum(len(piece.possible_moves()) for piece in chess_instance.board[chess_instance.turn])
+
+
+def legal_moves(chess_instance):
+	chess_instance._cache_.clear()  # legal moves are cached per position
+	return chess_instance.legal_moves()
+
+
+def make_undo_legal_moves(chess_instance):
+	board, player = chess_instance.board, chess_instance.turn
+	king = board[King][player][0]
+	moves = []
+	for piece in board[player]:
+		for move in piece.possible_moves():
+			board.make_move(move)
+			if not king.under_check():
+				moves.append(move)
+			board.undo_move(move)
+	return moves
+
+
+def piece_queries(chess_instance):
+	board = chess_instance.board
+	found = len(board[chess_instance.turn]) + len(board[chess_instance.turn.enemy])
+	for piece_cls in (King, Queen, Rook, Bishop, Knight, Pawn):
+		found += sum(map(len, board[piece_cls].values()))
+	return found
+
+
+def benchmark(backend: str, repeat: int, fn):
+	chess_instance = chess.from_initial(backend)
+	elapsed, count = 0.0, 0
+	for notation in GAME:
+		start = time.perf_counter()
+		for _ in range(repeat):
+			count += fn(chess_instance)
+		elapsed += time.perf_counter() - start
+		chess_instance.make_move(Move.from_notation(notation, chess_instance))
+	return elapsed, count
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--repeat', default=10, type=int, help='move generations per position. default `10`')
+	parser.add_argument('--rounds', default=3, type=int, help='rounds timed (the best is reported). default `3`')
+	args = parser.parse_args()
+
+	for title, fn, repeat in [
+		('move generation', pseudo_legal_moves, args.repeat),
+		('legal moves', lambda chess_instance: len(legal_moves(chess_instance)), args.repeat),
+		('legal moves (make and undo)', lambda chess_instance: len(make_undo_legal_moves(chess_instance)), args.repeat),
+		('piece queries', piece_queries, args.repeat * 100),
+	]:
+		print(title)
+		results = {name: (float('inf'), 0) for name in BACKENDS}
+		for _ in range(args.rounds):
+			for name in BACKENDS:
+				results[name] = min(results[name], benchmark(name, repeat, fn))
+		for name, (elapsed, count) in results.items():
+			print(f'{name:>10}: {elapsed:.3f}s {count} items ({count / elapsed:.0f} items/s)')
+		print(f'speedup (dict / bitboard): {results["dict"][0] / results["bitboard"][0]:.2f}x')
@@ -0,0 +1,87 @@
+import argparse
+import time
+import tracemalloc
+from array import array
+
+import chess
+from utils import Move
+from .board_backends import GAME, legal_moves
+
+"""
+Memory and allocations of moves.
+Compares moves with slots (`utils.Move`), moves with a dictionary per instance (as before slots)
+and packed moves (16 bit integers, Refer `Move.code`) in an array,
+- bytes held by the legal moves of every position of a game.
+- peak allocation (and time) generating the legal moves (Refer `Chess.legal_moves`, the cache is cleared each time).
+
+Run from the project root using
+python -m benchmarks.moves
+"""
+
+
+class DictMove:
+	# Move with a dictionary per instance (`Move` without slots)
+	__init__ = Move.__init__
+
+
+def copy_move(cls, move: Move):
+	return cls(move.player, move.piece, move.old_square, move.new_square, move.piece_moved, move.captured_piece,
+			   move.en_passant_pawn, move.en_passant_pawn_square, move.en_passant_pawn_moved, move.castle_rook,
+			   move.rook_old_square, move.rook_new_square, move.rook_moved, move.pawn_promoted, move.new_piece)
+
+
+def positions_moves():
+	# Legal moves of each position of the game
+	chess_instance, moves = chess.from_initial(), []
+	for notation in GAME:
+		moves.append(list(chess_instance.legal_moves()))
+		chess_instance.make_move(Move.from_notation(notation, chess_instance))
+	return moves
+
+
+def held_bytes(build) -> int:
+	# bytes allocated (and still held) by the result of build
+	tracemalloc.start()
+	snapshot = tracemalloc.take_snapshot()
+	result = build()
+	size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'filename'))
+	tracemalloc.stop()
+	del result
+	return size
+
+
+def generation(repeat: int):
+	# peak bytes allocated (over the bytes held before) and time generating the legal moves of each position
+	chess_instance, peak, elapsed = chess.from_initial(), 0, 0.0
+	for notation in GAME:
+		tracemalloc.start()
+		for _ in range(repeat):
+			legal_moves(chess_instance)
+		peak = max(peak, tracemalloc.get_traced_memory()[1])
+		tracemalloc.stop()
+		start = time.perf_counter()
+		for _ in range(repeat):
+			legal_moves(chess_instance)
+		elapsed += time.perf_counter() - start
+		chess_instance.make_move(Move.from_notation(notation, chess_instance))
+	return peak, elapsed
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--repeat', default=10, type=int, help='move generations per position. default `10`')
+	args = parser.parse_args()
+
+	moves = positions_moves()
+	count = sum(map(len, moves))
+	print(f'legal moves of {len(moves)} positions ({count} moves)')
+	for title, build in [
+		('slots', lambda: [[copy_move(Move, move) for move in position] for position in moves]),
+		('dict', lambda: [[copy_move(DictMove, move) for move in position] for position in moves]),
+		('packed', lambda: [array('H', [move.code for move in position]) for position in moves]),
+	]:
+		size = held_bytes(build)
+		print(f'{title:>10}: {size} bytes ({size / count:.1f} bytes/move)')
+
+	peak, elapsed = generation(args.repeat)
+	print(f'generating legal moves {args.repeat}x per position: peak {peak} bytes allocated, {elapsed:.3f}s')
@@ -0,0 +1,131 @@
+import argparse
+import random
+import re
+import time
+from collections import Counter
+from typing import List
+
+import chess
+from pieces import King, Queen, Rook, Bishop, Knight, Pawn
+from utils import Move, Square, read_pgn
+
+"""
+Compares the SAN parser and encoder (Refer `chess.san`) with the previous implementation,
+which generated the moves of every piece of the type (for parsing and resolving ambiguity).
+Games are read from a PGN archive, or generated by playing random (legal) moves.
+
+Run from the project root using
+python -m benchmarks.san --games 200
+python -m benchmarks.san --pgn games.pgn.gz --games 10000
+"""
+
+LEGACY_PIECES = {'K': King, 'Q': Queen, 'R': Rook, 'B': Bishop, 'N': Knight, None: Pawn}
+
+
+def legacy_from_notation(notation: str, chess_instance) -> Move:
+	# Previous implementation of `Move.from_notation`
+	player = chess_instance.turn
+	match = re.match('^O-O(?P<queen_side>-O)?[+#]?$', notation)
+	if match:
+		king = chess_instance[King][player][0]
+		y = king.square.y
+		if match.group('queen_side'):
+			return Move.castle(chess_instance.board, king=king, new_king_square=Square(2, y),
+							   rook=chess_instance[Square(0, y)], new_rook_square=Square(3, y))
+		return Move.castle(chess_instance.board, king=king, new_king_square=Square(6, y),
+						   rook=chess_instance[Square(7, y)], new_rook_square=Square(5, y))
+	match = re.match(
+		'^(?P<piece>[NBRQK])?(?P<ambiguity>[a-h]|[1-8])?(?P<captured>x)?(?P<square>[a-h][1-8])'
+		'(=(?P<promoted>[NBRQ]))?(?P<enpassant>\\(ep\\))?([+#])?$',
+		notation)
+	piece_cls = LEGACY_PIECES[match.group('piece')]
+	new_square = Square.from_notation(match.group('square'))
+	ambiguity = match.group('ambiguity')
+	for piece in chess_instance[piece_cls][player]:
+		for move in piece.possible_moves():
+			if move.new_square == new_square:
+				if not ambiguity or ambiguity in move.old_square.notation:
+					if match.group('promoted'):
+						move.new_piece = LEGACY_PIECES[match.group('promoted')](player, chess_instance.board)
+					return move
+
+
+def legacy_notation(move: Move, chess_instance) -> str:
+	# Previous implementation of the notation of `Move.update_notation` (before the move)
+	if move.castle_rook:
+		return 'O-O' if move.new_square.x == 6 else 'O-O-O'
+	n_piece = move.piece.notation
+	n_captured = 'x' if move.captured_piece or move.en_passant_pawn else ''
+	n_promoted = f'={move.new_piece.notation}' if move.pawn_promoted else ''
+	n_ambiguity = ''
+	if not n_piece and n_captured:
+		n_piece = move.old_square.notation[0]
+	elif n_piece:
+		other_pieces = [piece for piece in chess_instance.board[type(move.piece)][move.player] if piece != move.piece and
+						any(other for other in piece.possible_moves() if other.new_square == move.new_square)]
+		if other_pieces:
+			counter = Counter(''.join([piece.square.notation for piece in other_pieces]))
+			if move.old_square.notation[0] not in counter:
+				n_ambiguity = move.old_square.notation[0]
+			else:
+				n_ambiguity = move.old_square.notation[1]
+	return f"{n_piece}{n_ambiguity}{n_captured}{move.new_square.notation}{n_promoted}"
+
+
+def random_games(count: int, max_plies: int, seed: int) -> List[List[str]]:
+	# Plays random legal moves from the initial position, returns the notations of the games
+	rng, games = random.Random(seed), []
+	for _ in range(count):
+		chess_instance = chess.from_initial()
+		for _ in range(max_plies):
+			moves = chess_instance.legal_moves()
+			if not moves:
+				break
+			chess_instance.make_move(rng.choice(moves))
+		games.append([move.notation for move in chess_instance._moves_.stack])
+	return games
+
+
+def benchmark(games: List[List[str]]):
+	# Returns the time taken (parsing, encoding) by the legacy and new implementations
+	elapsed = Counter()
+	for notations in games:
+		chess_instance = chess.from_initial()
+		for notation in notations:
+			start = time.perf_counter()
+			legacy_from_notation(notation, chess_instance)
+			elapsed['legacy parse'] += time.perf_counter() - start
+			start = time.perf_counter()
+			move = chess.from_san(notation, chess_instance)
+			elapsed['parse'] += time.perf_counter() - start
+
+			start = time.perf_counter()
+			legacy_notation(move, chess_instance)
+			elapsed['legacy encode'] += time.perf_counter() - start
+			start = time.perf_counter()
+			encoded = chess.to_san(move, chess_instance)
+			elapsed['encode'] += time.perf_counter() - start
+			assert notation.rstrip('+#') == encoded, (notation, encoded)
+			chess_instance.push(move)
+	return elapsed
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--pgn', default=None, help='PGN archive of games. default random games')
+	parser.add_argument('--games', default=100, type=int, help='number of games. default `100`')
+	parser.add_argument('--plies', default=120, type=int, help='maximum plies of random games. default `120`')
+	parser.add_argument('--seed', default=0, type=int, help='seed for the random games. default `0`')
+	args = parser.parse_args()
+
+	if args.pgn:
+		games = [game.moves for game, _ in zip(read_pgn(args.pgn), range(args.games))]
+	else:
+		games = random_games(args.games, args.plies, args.seed)
+	plies = sum(map(len, games))
+	elapsed = benchmark(games)
+	print(f'{len(games)} games, {plies} plies')
+	for kind in ('parse', 'encode'):
+		legacy, new = elapsed[f'legacy {kind}'], elapsed[kind]
+		print(f'{kind:>7}: legacy {legacy:.3f}s ({plies / legacy:.0f} moves/s), '
+			  f'new {new:.3f}s ({plies / new:.0f} moves/s), speedup {legacy / new:.2f}x')
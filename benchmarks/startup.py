@@ -0,0 +1,52 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+"""
+Startup cost (time and memory) of importing the rules in a fresh interpreter, like each worker process does.
+Compares importing the rules alone (pygame and cv2 are imported lazily, Refer `utils.lazy`)
+with importing them along with pygame and cv2 (as every import of `board`, `pieces`, `chess` or `utils` did before).
+
+Run from the project root using
+python -m benchmarks.startup --repeat 10
+"""
+
+RULES = 'import chess, engine'
+SCENARIOS = [
+	('rules', RULES),
+	('rules + pygame + cv2', f'import pygame, cv2; {RULES}'),
+]
+# Prints the time taken for the imports, the peak memory and whether the GUI and video libraries were imported
+PROGRAM = '''
+import resource, sys, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+loaded = [name for name in ('pygame', 'cv2', 'numpy') if type(sys.modules.get(name)).__name__ == 'module']
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, ','.join(loaded) or '-')
+'''
+
+
+def measure(imports: str, repeat: int):
+	# Returns the (median) import time, peak memory (in KB) and the libraries imported
+	times, memory, loaded = [], [], ''
+	for _ in range(repeat):
+		output = subprocess.run([sys.executable, '-c', PROGRAM.format(imports=imports)], check=True,
+								capture_output=True, text=True,
+								env={**os.environ, 'PYGAME_HIDE_SUPPORT_PROMPT': '1'}).stdout.split()
+		times.append(float(output[0]))
+		memory.append(int(output[1]))
+		loaded = output[2]
+	return statistics.median(times), statistics.median(memory), loaded
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--repeat', default=5, type=int, help='interpreters started per scenario. default `5`')
+	args = parser.parse_args()
+
+	for title, imports in SCENARIOS:
+		elapsed, memory, loaded = measure(imports, args.repeat)
+		print(f'{title:>22}: {elapsed * 1000:7.1f}ms, peak memory {memory / 1024:6.1f}MB, libraries imported: {loaded}')
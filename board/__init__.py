@@ -1 +1,8 @@
-from .board import Board
\ No newline at end of file
+from .board import Board
+from .bitboard import BitBoard
+
+# Board implementations that can back a chess game (Refer `chess.from_initial`)
+BACKENDS = {
+	'dict': Board,
+	'bitboard': BitBoard,
+}
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from typing import List, Union, Dict, Type, Tuple, Iterator
+
+from pieces import Piece, King, Queen, Rook, Bishop, Knight, Pawn
+from pieces.tables import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BISHOP_RAY_MASKS, ROOK_RAY_MASKS
+from utils import Player, Square, Move, History
+from .board import Board
+
+# Squares are indexed as `y * 8 + x`, that is a8 -> 0, h8 -> 7, a1 -> 56 and h1 -> 63.
+SQUARES: List[Square] = [Square(index % 8, index // 8) for index in range(64)]
+SQUARE_INDEX: Dict[Square, int] = {square: index for index, square in enumerate(SQUARES)}
+
+
+def iter_bits(bitboard: int) -> Iterator[int]:
+	# yields the indices of the set bits (squares) of the bitboard, lowest first.
+	while bitboard:
+		lsb = bitboard & -bitboard
+		yield lsb.bit_length() - 1
+		bitboard ^= lsb
+
+
+class BitBoard(Board):
+	# Board backed by 64 bit integers (one per piece type and player) and occupancy masks per player.
+	# Queries for the pieces of a player or of a type only visit the set bits instead of scanning all the pieces.
+	def __init__(self, moves_history: History[Move]):
+		super().__init__(moves_history)
+		self._squares_: List[Piece] = [None] * 64  # piece on each square (by index)
+		self._piece_index_: Dict[Piece, int] = dict()  # square index of each piece on the board
+		self._bitboards_: Dict[Tuple[Type[Piece], Player], int] = dict()
+		self._occupancy_: Dict[Player, int] = {Player.WHITE: 0, Player.BLACK: 0}
+
+	def __getitem__(self, item: Union[Piece, Square, Player, Type[Piece]]) \
+			-> Union[Square, Piece, List[Piece], Dict[Player, List[Piece]]]:
+		# NOTE: squares are checked first, as they are by far the most frequent queries
+		if isinstance(item, Square):  # piece on the square
+			index = SQUARE_INDEX.get(item)  # squares off the board have no index
+			return self._squares_[index] if index is not None else None
+		elif isinstance(item, Piece):  # square where piece is
+			index = self._piece_index_.get(item)
+			return SQUARES[index] if index is not None else None
+		elif isinstance(item, Player):  # pieces belonging to player
+			return [self._squares_[index] for index in iter_bits(self._occupancy_[item])]
+		elif issubclass(item, Piece):  # Returns the pieces of specified type on the board.
+			return {player: [self._squares_[index] for index in iter_bits(self.bitboard(item, player))]
+					for player in (Player.WHITE, Player.BLACK)}
+
+	def bitboard(self, piece_cls: Type[Piece], player: Player) -> int:
+		# Returns the squares (as bits) occupied by pieces of the type belonging to player.
+		if piece_cls is Piece:  # all the pieces of the player
+			return self._occupancy_[player]
+		return self._bitboards_.get((piece_cls, player), 0)
+
+	def occupancy(self, player: Player = None) -> int:
+		# Returns the squares (as bits) occupied by the pieces of the player (or by all pieces).
+		if player is None:
+			return self._occupancy_[Player.WHITE] | self._occupancy_[Player.BLACK]
+		return self._occupancy_[player]
+
+	@staticmethod
+	def _slider_attacks_(ray_masks, occupied: int) -> int:
+		# Returns the squares (as bits) along the rays up to and including the first piece (of either player).
+		attacks = 0
+		for mask, towards_higher in ray_masks:
+			blockers = mask & occupied
+			if not blockers:
+				attacks |= mask
+			elif towards_higher:  # the squares of the ray below (and including) the lowest blocker
+				first = blockers & -blockers
+				attacks |= mask & ((first << 1) - 1)
+			else:  # the squares of the ray above (and including) the highest blocker
+				first = 1 << (blockers.bit_length() - 1)
+				attacks |= mask & -first
+		return attacks
+
+	def _attack_bits_(self, piece: Piece, index: int) -> int:
+		# Returns the squares (as bits) where the piece on the square (index) can capture,
+		# from the attack masks of the square and the occupancy masks.
+		piece_cls, player = type(piece), piece.player
+		if piece_cls is Knight:
+			attacks = KNIGHT_ATTACKS[index]
+		elif piece_cls is Pawn:
+			attacks = PAWN_ATTACKS[player][index]
+		elif piece_cls is King:
+			attacks = KING_ATTACKS[index]
+		else:
+			occupied = self._occupancy_[Player.WHITE] | self._occupancy_[Player.BLACK]
+			attacks = 0
+			if piece_cls is not Bishop:  # rook or queen
+				attacks = self._slider_attacks_(ROOK_RAY_MASKS[index], occupied)
+			if piece_cls is not Rook:  # bishop or queen
+				attacks |= self._slider_attacks_(BISHOP_RAY_MASKS[index], occupied)
+		return attacks & ~self._occupancy_[player]
+
+	def attack_squares_of(self, piece: Piece) -> List[Square]:
+		# Same as `Board.attack_squares_of`, from the masks instead of probing the squares.
+		return [SQUARES[index] for index in iter_bits(self._attack_bits_(piece, self._piece_index_[piece]))]
+
+	def typical_moves_of(self, piece: Piece) -> List[Move]:
+		# Same as `Board.typical_moves_of`, the fields common to the moves are looked up once.
+		index, squares = self._piece_index_[piece], self._squares_
+		old_square, player, moved = SQUARES[index], piece.player, self._piece_moved_.get(piece)
+		return [Move(player, piece, old_square, SQUARES[new_index], moved, captured_piece=squares[new_index])
+				for new_index in iter_bits(self._attack_bits_(piece, index))]
+
+	def pawn_moves_of(self, pawn: Pawn) -> List[Move]:
+		# Same as `Board.pawn_moves_of`, the squares forward are tested against the occupancy masks.
+		index, player, squares = self._piece_index_[pawn], pawn.player, self._squares_
+		occupied = self._occupancy_[Player.WHITE] | self._occupancy_[Player.BLACK]
+		step, initial_rank, last_rank = (-8, 6, 1) if player == Player.WHITE else (8, 1, 6)  # rank (y) of the square
+		targets = PAWN_ATTACKS[player][index] & self._occupancy_[player.enemy]  # captures
+		forward = index + step  # pawns are never on the last rank, so always on the board
+		if not occupied >> forward & 1:
+			targets |= 1 << forward
+			if index >> 3 == initial_rank and not occupied >> (forward + step) & 1:
+				targets |= 1 << (forward + step)
+		old_square, moved, promoted = SQUARES[index], self._piece_moved_.get(pawn), index >> 3 == last_rank or None
+		return [Move(player, pawn, old_square, SQUARES[new_index], moved, captured_piece=squares[new_index],
+					 pawn_promoted=promoted) for new_index in iter_bits(targets)]
+
+	def is_attacked(self, square: Square, player: Player) -> bool:
+		# Same as `Board.is_attacked`, using the attack masks of the square against the bitboards of `player`.
+		index, bitboards = SQUARE_INDEX[square], self._bitboards_
+		if KNIGHT_ATTACKS[index] & bitboards.get((Knight, player), 0) or \
+				PAWN_ATTACKS[player.enemy][index] & bitboards.get((Pawn, player), 0) or \
+				KING_ATTACKS[index] & bitboards.get((King, player), 0):
+			return True
+		occupied = self._occupancy_[Player.WHITE] | self._occupancy_[Player.BLACK]
+		queens = bitboards.get((Queen, player), 0)
+		for ray_masks, sliders in ((ROOK_RAY_MASKS[index], bitboards.get((Rook, player), 0) | queens),
+								   (BISHOP_RAY_MASKS[index], bitboards.get((Bishop, player), 0) | queens)):
+			if not sliders:
+				continue
+			for mask, towards_higher in ray_masks:
+				blockers = mask & occupied
+				if blockers:  # only the first piece along the ray can attack
+					first = blockers & -blockers if towards_higher else 1 << (blockers.bit_length() - 1)
+					if first & sliders:
+						return True
+		return False
+
+	def _put_(self, piece: Piece, square: Square):
+		index = SQUARE_INDEX[square]
+		bit = 1 << index
+		key = (type(piece), piece.player)
+		self._squares_[index] = piece
+		self._piece_index_[piece] = index
+		self._bitboards_[key] = self._bitboards_.get(key, 0) | bit
+		self._occupancy_[piece.player] |= bit
+
+	def _remove_(self, piece: Piece, square: Square):
+		index = self._piece_index_.pop(piece)
+		bit = 1 << index
+		key = (type(piece), piece.player)
+		self._squares_[index] = None
+		self._bitboards_[key] ^= bit
+		self._occupancy_[piece.player] ^= bit
+
+	def _relocate_(self, piece: Piece, old_square: Square, new_square: Square):
+		old_index, new_index = self._piece_index_[piece], SQUARE_INDEX[new_square]
+		bits = (1 << old_index) | (1 << new_index)
+		key = (type(piece), piece.player)
+		self._squares_[old_index] = None
+		self._squares_[new_index] = piece
+		self._piece_index_[piece] = new_index
+		self._bitboards_[key] ^= bits
+		self._occupancy_[piece.player] ^= bits
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, List, Set, Union, Dict, Tuple, Type
 
-import pygame
-
 from constants import BOARD_LEFT, BOARD_TOP, SQUARE, WHITE_SQUARE_COLOR, BLACK_SQUARE_COLOR, BOARD_MARGIN_COLOR, \
 	BOARD_RECT_WITH_MARGIN, BOARD_RECT, BOARD_MARGIN
-from pieces import Piece
-from utils import Player, Square, Move, History
+from pieces import Piece, King, Queen, Rook, Bishop, Knight, Pawn
+from pieces.tables import KNIGHT_SQUARES, KING_SQUARES, PAWN_ATTACK_SQUARES, BISHOP_RAYS, ROOK_RAYS
+from utils import Player, Square, Move, History, lazy_import
+from .zobrist import PIECE_KEYS, CASTLING_KEYS, EN_PASSANT_KEYS
+
+pygame = lazy_import('pygame')  # only for drawing
 
 if TYPE_CHECKING:
 	from pygame import Surface
@@ -20,6 +22,13 @@ class Board:
 		self._piece_to_square_map_: Dict[Piece, Square] = dict()
 		self._piece_moved_: Dict[Piece, bool] = dict()
 		self._moves_history_ = moves_history
+		self._previous_move_: Move = None  # move made before the moves in history (like when set up from a FEN)
+		# Zobrist hash of the position (pieces, castling rights and en-passant), computed on first use
+		# and then updated incrementally with each move.
+		self._hash_: int = None
+		self._en_passant_key_: int = 0
+		# Hash of the placement of the piece objects (unlike zobrist hash, two rooks swapping squares changes it)
+		self._identity_hash_: int = None
 
 	def __getitem__(self, item: Union[Piece, Square, Player, Type[Piece]]) \
 			-> Union[Square, Piece, List[Piece], Dict[Player, List[Piece]]]:
@@ -37,77 +46,203 @@ class Board:
 							   if isinstance(piece, item) and piece.player == Player.BLACK],
 			}
 
-	def add(self, piece: Piece, square: Square):
-		self._square_to_piece_map_[square] = piece
-		self._piece_to_square_map_[piece] = square
+	def add(self, piece: Piece, square: Square, moved: bool = None):
+		# moved -- whether piece has moved from its initial square (if known, like when setting up a position)
+		self._put_(piece, square)
+		if moved is not None:
+			self._piece_moved_[piece] = moved
+		self._hash_ = self._identity_hash_ = None  # recomputed when needed
+
+	def set_previous_move(self, move: Move):
+		# Sets the move made before the moves in history, the last move when history is empty.
+		# Used when setting up a position where en-passant is possible (the two square pawn move).
+		self._previous_move_ = move
+		self._hash_ = None  # recomputed when needed
 
 	def moved(self, piece: Piece) -> bool:
 		return self._piece_moved_.get(piece)
 
-	def make_move(self, move: Move):
+	# Low level operations on the piece placement, all updates to the board go through these.
+	# Alternate backends (like `BitBoard`) override these along with `__getitem__`.
+	def _put_(self, piece: Piece, square: Square):
+		# places the piece on the (empty) square
+		self._square_to_piece_map_[square] = piece
+		self._piece_to_square_map_[piece] = square
+
+	def _remove_(self, piece: Piece, square: Square):
+		# removes the piece from the square it is on
+		del self._square_to_piece_map_[square]
+		del self._piece_to_square_map_[piece]
+
+	def _relocate_(self, piece: Piece, old_square: Square, new_square: Square):
+		# moves the piece from old_square to the (empty) new_square
+		self._piece_to_square_map_[piece] = new_square
+		self._square_to_piece_map_[new_square] = piece
+		del self._square_to_piece_map_[old_square]
+
+	def make_move(self, move: Move, update_hash: bool = True):
 		# updates the positions of (and removes) pieces on the board.
 		# NOTE: Expects all the required fields for the move to be populated (including promotion)
+		# update_hash -- can be false only when the move is undone (also with false) before using the hashes,
+		# like while testing if a move results in a check
+		update_hash = update_hash and self._hash_ is not None
+		if update_hash:
+			castling_may_change = isinstance(move.captured_piece, Rook) or \
+				(not move.piece_moved and isinstance(move.piece, (King, Rook)))
+			hash_ = self._hash_ ^ self._en_passant_key_ ^ self._move_key_(move)
+			if castling_may_change:
+				hash_ ^= self._castling_key_()
+			self._identity_hash_ ^= self._identity_key_(move)
 
 		# Typical move
-		self._piece_to_square_map_[move.piece] = move.new_square
-		self._square_to_piece_map_[move.new_square] = move.piece
-		del self._square_to_piece_map_[move.old_square]
-		self._piece_moved_[move.piece] = True
 		if move.captured_piece:  # If any captured, remove from board.
-			del self._piece_to_square_map_[move.captured_piece]
+			self._remove_(move.captured_piece, move.new_square)
+		self._relocate_(move.piece, move.old_square, move.new_square)
+		self._piece_moved_[move.piece] = True
 
 		# En-passant move
 		if move.en_passant_pawn:
-			del self._piece_to_square_map_[move.en_passant_pawn]
-			del self._square_to_piece_map_[move.en_passant_pawn_square]
+			self._remove_(move.en_passant_pawn, move.en_passant_pawn_square)
 
 		# Castle
 		if move.castle_rook:
-			self._piece_to_square_map_[move.castle_rook] = move.rook_new_square
-			self._square_to_piece_map_[move.rook_new_square] = move.castle_rook
-			del self._square_to_piece_map_[move.rook_old_square]
+			self._relocate_(move.castle_rook, move.rook_old_square, move.rook_new_square)
 			self._piece_moved_[move.castle_rook] = True
 
 		# Pawn Promotion
 		if move.pawn_promoted and move.new_piece:
-			del self._piece_to_square_map_[move.piece]
-			self._piece_to_square_map_[move.new_piece] = move.new_square
-			self._square_to_piece_map_[move.new_square] = move.new_piece
+			self._remove_(move.piece, move.new_square)
+			self._put_(move.new_piece, move.new_square)
 			self._piece_moved_[move.new_piece] = True
 
-	def undo_move(self, move: Move):
+		if update_hash:
+			if castling_may_change:
+				hash_ ^= self._castling_key_()
+			self._en_passant_key_ = self._en_passant_key_of_(move)
+			self._hash_ = hash_ ^ self._en_passant_key_
+
+	def undo_move(self, move: Move, update_hash: bool = True):
 		# Undo's the move, and restores pieces back to their previous positions on the board/
 		# NOTE: The move must be the previously applied move on the board.
+		update_hash = update_hash and self._hash_ is not None
+		if update_hash:
+			castling_may_change = isinstance(move.captured_piece, Rook) or \
+				(not move.piece_moved and isinstance(move.piece, (King, Rook)))
+			hash_ = self._hash_ ^ self._en_passant_key_ ^ self._move_key_(move)
+			if castling_may_change:
+				hash_ ^= self._castling_key_()
+			self._identity_hash_ ^= self._identity_key_(move)
 
-		# Typical move
-		self._piece_to_square_map_[move.piece] = move.old_square
-		self._square_to_piece_map_[move.old_square] = move.piece
-		del self._square_to_piece_map_[move.new_square]
+		# Typical move (and Pawn Promotion, where the new piece is replaced by the pawn)
+		if move.pawn_promoted and move.new_piece:
+			self._remove_(move.new_piece, move.new_square)  # remove new piece
+			del self._piece_moved_[move.new_piece]
+			self._put_(move.piece, move.old_square)
+		else:
+			self._relocate_(move.piece, move.new_square, move.old_square)
 		self._piece_moved_[move.piece] = move.piece_moved
 		if move.captured_piece:
-			self._piece_to_square_map_[move.captured_piece] = move.new_square
-			self._square_to_piece_map_[move.new_square] = move.captured_piece
+			self._put_(move.captured_piece, move.new_square)
 
 		# En-passant move
 		if move.en_passant_pawn:
-			self._piece_to_square_map_[move.en_passant_pawn] = move.en_passant_pawn_square
-			self._square_to_piece_map_[move.en_passant_pawn_square] = move.en_passant_pawn
+			self._put_(move.en_passant_pawn, move.en_passant_pawn_square)
 
 		# Castle
 		if move.castle_rook:
-			self._piece_to_square_map_[move.castle_rook] = move.rook_old_square
-			self._square_to_piece_map_[move.rook_old_square] = move.castle_rook
-			del self._square_to_piece_map_[move.rook_new_square]
+			self._relocate_(move.castle_rook, move.rook_new_square, move.rook_old_square)
 			self._piece_moved_[move.castle_rook] = move.rook_moved  # Not necessary, it must be false
 
-		# Pawn Promotion
+		if update_hash:
+			if castling_may_change:
+				hash_ ^= self._castling_key_()
+			# NOTE: by now the last move (if any) is the move before the undone move
+			self._en_passant_key_ = self._en_passant_key_of_(self.last_move)
+			self._hash_ = hash_ ^ self._en_passant_key_
+
+	@property
+	def zobrist_hash(self) -> int:
+		# Zobrist hash of the pieces on the board, castling rights and en-passant file (excludes player to move)
+		if self._hash_ is None:
+			self._compute_hashes_()
+		return self._hash_
+
+	@property
+	def identity_hash(self) -> int:
+		# Hash of the squares of the piece objects. Unlike zobrist hash, it identifies the pieces,
+		# so that values holding pieces (like moves) can be cached against it.
+		if self._identity_hash_ is None:
+			self._compute_hashes_()
+		return self._identity_hash_
+
+	def _compute_hashes_(self):
+		hash_, identity_hash = 0, 0
+		for player in (Player.WHITE, Player.BLACK):
+			for piece in self[player]:
+				square = piece.square
+				hash_ ^= PIECE_KEYS[type(piece), piece.player][square]
+				identity_hash ^= hash((id(piece), square))
+		self._en_passant_key_ = self._en_passant_key_of_(self.last_move)
+		self._hash_ = hash_ ^ self._castling_key_() ^ self._en_passant_key_
+		self._identity_hash_ = identity_hash
+
+	@staticmethod
+	def _move_key_(move: Move) -> int:
+		# XOR of the keys of the pieces (and squares) changed by the move.
+		keys = PIECE_KEYS[type(move.piece), move.player]
+		key = keys[move.old_square] ^ keys[move.new_square]
+		if move.captured_piece:
+			key ^= PIECE_KEYS[type(move.captured_piece), move.captured_piece.player][move.new_square]
+		if move.en_passant_pawn:
+			key ^= PIECE_KEYS[Pawn, move.player.enemy][move.en_passant_pawn_square]
+		if move.castle_rook:
+			rook_keys = PIECE_KEYS[Rook, move.player]
+			key ^= rook_keys[move.rook_old_square] ^ rook_keys[move.rook_new_square]
+		if move.pawn_promoted and move.new_piece:
+			key ^= keys[move.new_square] ^ PIECE_KEYS[type(move.new_piece), move.player][move.new_square]
+		return key
+
+	@staticmethod
+	def _identity_key_(move: Move) -> int:
+		# XOR of the identity keys of the pieces (and squares) changed by the move.
+		piece = id(move.piece)
+		key = hash((piece, move.old_square)) ^ hash((piece, move.new_square))
+		if move.captured_piece:
+			key ^= hash((id(move.captured_piece), move.new_square))
+		if move.en_passant_pawn:
+			key ^= hash((id(move.en_passant_pawn), move.en_passant_pawn_square))
+		if move.castle_rook:
+			rook = id(move.castle_rook)
+			key ^= hash((rook, move.rook_old_square)) ^ hash((rook, move.rook_new_square))
 		if move.pawn_promoted and move.new_piece:
-			del self._piece_to_square_map_[move.new_piece]  # remove new piece
+			key ^= hash((piece, move.new_square)) ^ hash((id(move.new_piece), move.new_square))
+		return key
+
+	def _castling_key_(self) -> int:
+		# XOR of the keys of castling rights, available if king and rook have not moved from their initial squares.
+		key, moved = 0, self._piece_moved_
+		for castling_key, player, king_square, rook_square in CASTLING_KEYS:
+			king = self[king_square]
+			if isinstance(king, King) and king.player == player and not moved.get(king):
+				rook = self[rook_square]
+				if isinstance(rook, Rook) and rook.player == player and not moved.get(rook):
+					key ^= castling_key
+		return key
+
+	def _en_passant_key_of_(self, move: Move) -> int:
+		# Key of the en-passant file if the move is a two square pawn move, which an enemy pawn can capture.
+		if move and isinstance(move.piece, Pawn) and abs(move.new_square.y - move.old_square.y) == 2:
+			x, y = move.new_square
+			for square in (Square(x - 1, y), Square(x + 1, y)):
+				piece = self[square]
+				if isinstance(piece, Pawn) and piece.player != move.player:
+					return EN_PASSANT_KEYS[x]
+		return 0
 
 	@property
 	def last_move(self) -> Move:
 		# Should board maintain the sequences of steps or the chess class?
-		return self._moves_history_.top()
+		return self._moves_history_.top() or self._previous_move_
 
 	def attacked_pieces(self, player: Player) -> List[Piece]:
 		# Returns all (enemy) pieces under attack by pieces of `player`
@@ -122,6 +257,90 @@ class Board:
 				pieces.append(piece)
 		return pieces
 
+	def is_attacked(self, square: Square, player: Player) -> bool:
+		# Returns whether pieces of `player` attack the square.
+		# Looks outward from the square (like a piece standing on it) for a piece of `player` that can capture back,
+		# instead of generating the attack squares of all the pieces of `player`.
+		pieces = self._square_to_piece_map_
+		for origin in KNIGHT_SQUARES[square]:
+			piece = pieces.get(origin)
+			if piece is not None and piece.player == player and isinstance(piece, Knight):
+				return True
+		# pawns of `player` attacking the square, are on squares a pawn of the enemy on it would attack
+		for origin in PAWN_ATTACK_SQUARES[player.enemy][square]:
+			piece = pieces.get(origin)
+			if piece is not None and piece.player == player and isinstance(piece, Pawn):
+				return True
+		for origin in KING_SQUARES[square]:
+			piece = pieces.get(origin)
+			if piece is not None and piece.player == player and isinstance(piece, King):
+				return True
+		for rays, slider_cls in ((ROOK_RAYS[square], Rook), (BISHOP_RAYS[square], Bishop)):
+			for ray in rays:
+				for origin in ray:
+					piece = pieces.get(origin)
+					if piece is not None:  # only the first piece along the ray can attack
+						if piece.player == player and isinstance(piece, (slider_cls, Queen)):
+							return True
+						break
+		return False
+
+	def checks_and_pins(self, square: Square, player: Player) \
+			-> Tuple[List[Piece], Set[Square], Dict[Piece, Set[Square]], Set[Square]]:
+		# Looks outward from the square (of the king of `player`) for enemy pieces giving check and pinning pieces.
+		# Returns (checkers, check mask, pins, behind squares)
+		# - check mask -- squares where a piece can capture the checker or block its ray (if in check by one piece)
+		# - pins -- squares (along the ray, up to and including the pinner) each pinned piece can move to
+		# - behind squares -- squares behind the king along the rays of checking sliders (king moving there is in check)
+		enemy, piece_at = player.enemy, self.__getitem__
+		checkers, check_mask, pins, behind = [], set(), {}, set()
+		for origin in KNIGHT_SQUARES[square]:
+			piece = piece_at(origin)
+			if piece is not None and piece.player == enemy and isinstance(piece, Knight):
+				checkers.append(piece)
+				check_mask.add(origin)
+		for origin in PAWN_ATTACK_SQUARES[player][square]:
+			piece = piece_at(origin)
+			if piece is not None and piece.player == enemy and isinstance(piece, Pawn):
+				checkers.append(piece)
+				check_mask.add(origin)
+		for rays, slider_cls in ((ROOK_RAYS[square], Rook), (BISHOP_RAYS[square], Bishop)):
+			for ray in rays:
+				own_piece = None
+				for index, origin in enumerate(ray):
+					piece = piece_at(origin)
+					if piece is None:
+						continue
+					if piece.player == player:
+						if own_piece is not None:  # two pieces of player shield the king
+							break
+						own_piece = piece
+						continue
+					if isinstance(piece, (slider_cls, Queen)):
+						if own_piece is None:
+							checkers.append(piece)
+							check_mask.update(ray[:index + 1])
+							behind_square = Square(2 * square.x - ray[0].x, 2 * square.y - ray[0].y)
+							if behind_square:
+								behind.add(behind_square)
+						else:
+							pins[own_piece] = set(ray[:index + 1])
+					break
+		return checkers, check_mask, pins, behind
+
+	def attack_squares_of(self, piece: Piece) -> List[Square]:
+		# Returns the squares where the piece (on the board) can capture, alternate backends (like `BitBoard`)
+		# compute these from their own representation instead of probing the squares one at a time.
+		return piece._attack_squares_()
+
+	def typical_moves_of(self, piece: Piece) -> List[Move]:
+		# Returns the typical moves (move or capture) of the piece to its attack squares
+		return [Move.typical(self, piece, square) for square in self.attack_squares_of(piece)]
+
+	def pawn_moves_of(self, pawn: Pawn) -> List[Move]:
+		# Returns the moves forward and the captures of the pawn (promotions without the new piece), except en-passant
+		return pawn._pawn_moves_()
+
 	def attacked_squares(self, player: Player) -> Set[Piece]:
 		# Returns all squares, where pieces of `player` can capture enemy piece.
 		squares = set()
@@ -129,42 +348,82 @@ class Board:
 			squares.update(piece.attack_squares())
 		return squares
 
+	# Surfaces drawn once and reused (every frame), highlight overlays keyed by
+	# (shape, color, alpha, width, radius factor) and board backgrounds (with coordinates) by (font, size and colors)
+	_highlight_cache_: Dict[Tuple, Surface] = {}
+	_background_cache_: Dict[Tuple, Surface] = {}
+
+	@staticmethod
+	def _highlight_surface_(shape: str, color: Tuple[int, int, int], alpha: int, width: int, rf: float) -> Surface:
+		key = (shape, color, alpha, width, rf)
+		square_surf = Board._highlight_cache_.get(key)
+		if square_surf is None:
+			square_surf = pygame.Surface((SQUARE, SQUARE), pygame.SRCALPHA)
+			square_surf.set_colorkey((0, 0, 0))  # color -- which will become transparent
+			square_surf.set_alpha(alpha)  # 255 -- opaque
+			if shape == 'circle':
+				pygame.draw.circle(square_surf, color, (SQUARE // 2, SQUARE // 2), int(rf * SQUARE // 2), width)
+			else:
+				pygame.draw.rect(square_surf, color, (0, 0, SQUARE, SQUARE), width)
+			Board._highlight_cache_[key] = square_surf
+		return square_surf
+
 	@staticmethod
 	def highlight_square(win: Surface, square: Square, color: Tuple[int, int, int], alpha=128, width=0):
-		rect = pygame.Rect(BOARD_LEFT + square.x * SQUARE, BOARD_TOP + square.y * SQUARE, SQUARE, SQUARE)
-		square_surf = pygame.Surface(rect.size, pygame.SRCALPHA)
-		square_surf.set_colorkey((0, 0, 0))  # color -- which will become transparent
-		square_surf.set_alpha(alpha)  # 255 -- opaque
-		pygame.draw.rect(square_surf, color, (0, 0, SQUARE, SQUARE), width)
-		win.blit(square_surf, rect)
+		win.blit(Board._highlight_surface_('square', color, alpha, width, 1.0),
+				 (BOARD_LEFT + square.x * SQUARE, BOARD_TOP + square.y * SQUARE))
 
 	@staticmethod
 	def highlight_circle(win: Surface, square: Square, color: Tuple[int, int, int], alpha=128, width=0, rf=1.0):
 		# rf -- radius factor -- how much to shrink the radius (0.0 to 1.0)
-		rect = pygame.Rect(BOARD_LEFT + square.x * SQUARE, BOARD_TOP + square.y * SQUARE, SQUARE, SQUARE)
-		square_surf = pygame.Surface(rect.size, pygame.SRCALPHA)
-		square_surf.set_colorkey((0, 0, 0))  # color -- which will become transparent
-		square_surf.set_alpha(alpha)  # 255 -- opaque
-		pygame.draw.circle(square_surf, color, (SQUARE // 2, SQUARE // 2), int(rf * SQUARE // 2), width)
-		win.blit(square_surf, rect)
+		win.blit(Board._highlight_surface_('circle', color, alpha, width, rf),
+				 (BOARD_LEFT + square.x * SQUARE, BOARD_TOP + square.y * SQUARE))
+
+	@staticmethod
+	def draw_square(win: Surface, square: Square, piece_image: Surface = None, highlights=()):
+		# Draws the square (background, highlights and then the piece) -- Refer `Chess.square_states`
+		# highlights -- (shape ('square' or 'circle'), color, alpha, width, radius factor) of each highlight
+		x, y = square
+		color = BLACK_SQUARE_COLOR if (x + y) % 2 else WHITE_SQUARE_COLOR
+		pygame.draw.rect(win, color, (BOARD_LEFT + x * SQUARE, BOARD_TOP + y * SQUARE, SQUARE, SQUARE))
+		for shape, highlight_color, alpha, width, rf in highlights:
+			if shape == 'circle':
+				Board.highlight_circle(win, square, highlight_color, alpha, width, rf)
+			else:
+				Board.highlight_square(win, square, highlight_color, alpha, width)
+		if piece_image:
+			img_rect: pygame.Rect = piece_image.get_rect()
+			img_rect.center = (BOARD_LEFT + SQUARE * x + SQUARE // 2, BOARD_TOP + SQUARE * y + SQUARE // 2)
+			win.blit(piece_image, img_rect.topleft)
 
 	@staticmethod
 	def draw(win: Surface, font: Font):
-		pygame.draw.rect(win, BLACK_SQUARE_COLOR, BOARD_RECT_WITH_MARGIN)
-		pygame.draw.rect(win, WHITE_SQUARE_COLOR, BOARD_RECT, 5)
+		key = (font, SQUARE, WHITE_SQUARE_COLOR, BLACK_SQUARE_COLOR)
+		background = Board._background_cache_.get(key)
+		if background is None:
+			background = Board._background_cache_[key] = Board._draw_background_(font)
+		win.blit(background, (0, 0))
+
+	@staticmethod
+	def _draw_background_(font: Font) -> Surface:
+		# Board with margins and coordinates
+		background = pygame.Surface(pygame.Rect(BOARD_RECT_WITH_MARGIN).size)
+		pygame.draw.rect(background, BLACK_SQUARE_COLOR, BOARD_RECT_WITH_MARGIN)
+		pygame.draw.rect(background, WHITE_SQUARE_COLOR, BOARD_RECT, 5)
 		for i in range(8):	# Ranks
 			text_surf: Surface = font.render(f"{8 - i}", True, WHITE_SQUARE_COLOR)
 			text_rect: pygame.Rect = text_surf.get_rect()
 			text_rect.center = (BOARD_LEFT - BOARD_MARGIN // 2, BOARD_TOP + SQUARE * i + SQUARE // 2)
-			win.blit(text_surf, text_rect)
+			background.blit(text_surf, text_rect)
 
 		for j in range(8):	# Files
 			text_surf: Surface = font.render(f"{chr(65 + j)}", True, WHITE_SQUARE_COLOR)
 			text_rect: pygame.Rect = text_surf.get_rect()
 			text_rect.center = (BOARD_LEFT + SQUARE * j + SQUARE // 2, BOARD_TOP + 8 * SQUARE + BOARD_MARGIN // 2)
-			win.blit(text_surf, text_rect)
+			background.blit(text_surf, text_rect)
 		for x in range(8):
 			for y in range(8):
 				color = BLACK_SQUARE_COLOR if (x + y) % 2 else WHITE_SQUARE_COLOR
 				rect = (BOARD_LEFT + x * SQUARE, BOARD_TOP + y * SQUARE, SQUARE, SQUARE)
-				pygame.draw.rect(win, color, rect)
+				pygame.draw.rect(background, color, rect)
+		return background
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import random
+from typing import Dict, Tuple, Type
+
+from pieces import Piece, King, Queen, Rook, Bishop, Knight, Pawn
+from pieces.tables import ALL_SQUARES
+from utils import Player, Square
+
+"""
+Random 64 bit keys for Zobrist hashing of positions.
+The hash of a position is the XOR of the keys of each piece on its square, the available castling rights,
+the file of the en-passant square (only if it can be captured) and the player to move (if black).
+Keys are generated from a fixed seed, so hashes are the same across runs and processes.
+"""
+
+_random = random.Random(0x5EED)
+
+
+def _key() -> int:
+	return _random.getrandbits(64)
+
+
+PIECE_KEYS: Dict[Tuple[Type[Piece], Player], Dict[Square, int]] = {
+	(piece_cls, player): {square: _key() for square in ALL_SQUARES}
+	for piece_cls in (King, Queen, Rook, Bishop, Knight, Pawn) for player in (Player.WHITE, Player.BLACK)
+}
+
+# Castling right -> (key, player, king square, rook square)
+CASTLING_KEYS = (
+	(_key(), Player.WHITE, Square(4, 7), Square(7, 7)),
+	(_key(), Player.WHITE, Square(4, 7), Square(0, 7)),
+	(_key(), Player.BLACK, Square(4, 0), Square(7, 0)),
+	(_key(), Player.BLACK, Square(4, 0), Square(0, 0)),
+)
+
+EN_PASSANT_KEYS = tuple(_key() for _ in range(8))  # by file
+
+BLACK_TO_MOVE_KEY = _key()
@@ -0,0 +1,32 @@
+import argparse
+import time
+
+import chess
+from engine import OpeningBook, build_book
+
+"""
+Builds an opening book (Refer `engine.book`) from the first plies of the games of PGN archives, and probes positions.
+python book.py build games.pgn.gz --book book.bin --plies 16 --min-count 2
+python book.py probe --book book.bin --fen "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1"
+"""
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('command', choices=['build', 'probe'])
+	parser.add_argument('pgn', nargs='*', help='PGN archives (optionally compressed) to build the book from')
+	parser.add_argument('--book', default='book.bin', help='book file. default `book.bin`')
+	parser.add_argument('--plies', default=16, type=int, help='plies of each game added to the book. default `16`')
+	parser.add_argument('--min-count', default=2, type=int,
+						help='times a move must be played (from a position) to be added. default `2`')
+	parser.add_argument('--fen', default=chess.INITIAL_FEN, help='position to probe. default initial position')
+	args = parser.parse_args()
+
+	if args.command == 'build':
+		start = time.perf_counter()
+		games, records = build_book(args.pgn, args.book, args.plies, args.min_count)
+		print(f'{games} games, {records} moves written to {args.book} in {time.perf_counter() - start:.2f}s')
+	else:
+		with OpeningBook(args.book) as book:
+			chess_instance = chess.from_fen(args.fen)
+			for move, weight in book.moves(chess_instance):
+				print(f'{chess.to_san(move, chess_instance):>8} {move.uci:>6} {weight}')
@@ -1,2 +1,5 @@
-from .chess import Chess
-from .extras import from_initial
\ No newline at end of file
+from .chess import Chess, GameStatus
+from .extras import from_initial
+from .fen import from_fen, to_fen, from_position, INITIAL_FEN
+from .san import from_san, to_san
+from .renderer import Renderer
@@ -1,33 +1,53 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
-
-import pygame
-from pygame import K_LEFT, K_RIGHT, K_s
+from collections import Counter, namedtuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 from board import Board
+from board.zobrist import BLACK_TO_MOVE_KEY
 from constants import BOARD_TOP, BOARD_LEFT, BOARD_HEIGHT, BOARD_WIDTH, SQUARE, STATUS_RECT, BOARD_RECT
-from pieces import King, Piece
+from pieces import King, Piece, Queen, Rook, Bishop, Knight, Pawn
+from pieces.tables import ALL_SQUARES
 from utils import Move, Square, History, write_notations
-from utils import Player, Memoize
+from utils import Player, Memoize, CacheInfo, lazy_import
 from .promotion import get_promotion_selection, draw_promotion_menu
 
+pygame = lazy_import('pygame')  # only for drawing and handling events
+
 if TYPE_CHECKING:
 	from pygame import Surface
 	from pygame.font import Font
 
-cache = Memoize()
+PROMOTION_PIECES = (Queen, Rook, Bishop, Knight)
+
+# Status of the position (for the player to move), legal_moves -- number of legal moves
+GameStatus = namedtuple('GameStatus', ['check', 'checkmate', 'stalemate', 'draw', 'legal_moves'])
 
 
 class Chess:
-	def __init__(self, board: Board, turn: Player, move_history: History[Move]):
+	def __init__(self, board: Board, turn: Player, move_history: History[Move], cache_size: int = 4096,
+				 start_fen: str = None, halfmove_clock: int = 0, fullmove_number: int = 1):
 		self._board: Board = board
 		self._turn: Player = turn
 		self._moves_: History[Move] = move_history
+		self._start_fen_ = start_fen  # position (FEN) before the moves in history, if known
+		self._start_fullmove_number_ = fullmove_number  # before the moves in history
+		# Computed values (like possible moves) cached against the position, bounded to `cache_size` entries.
+		# Returning to a position (like with undo and redo) reuses them.
+		self._cache_ = Memoize(cache_size)
 		self._kings = {
 			Player.WHITE: next(filter(lambda piece: isinstance(piece, King), board[Player.WHITE])),
 			Player.BLACK: next(filter(lambda piece: isinstance(piece, King), board[Player.BLACK]))
 		}
+		# Draw detection, maintained with each move (and undo) so that queries need not replay the moves.
+		# Stacks (aligned with the moves in history, first entry is the starting position) of position hashes,
+		# half-move clocks and whether the material is insufficient for checkmate, with counts of each position hash.
+		# NOTE: Expects the move history to be empty (the position is the starting position)
+		self._hashes_: List[int] = [self.zobrist_hash]
+		self._clocks_: List[int] = [halfmove_clock]
+		self._insufficient_material_: List[bool] = [self._has_insufficient_material_()]
+		self._hash_counts_: Counter = Counter(self._hashes_)
+		self._statuses_: List[GameStatus] = [None]  # status of each position, computed when first needed
 
 		# UI state
 		self._selected_piece: Piece = None  # the current selected piece
@@ -41,27 +61,104 @@ class Chess:
 	def board(self):
 		return self._board
 
-	@cache.memoize
+	@property
+	def zobrist_hash(self) -> int:
+		# 64 bit hash identifying the position (pieces, castling rights, en-passant and player to move)
+		hash_ = self._board.zobrist_hash
+		return hash_ ^ BLACK_TO_MOVE_KEY if self._turn == Player.BLACK else hash_
+
+	@property
+	def cache_key(self):
+		# Identifies the position for caching, the identity hash ensures cached moves refer to the same piece objects.
+		return self.zobrist_hash, self._board.identity_hash
+
+	@property
+	def halfmove_clock(self) -> int:
+		# plies since the last capture or pawn move
+		return self._clocks_[-1]
+
+	@property
+	def fullmove_number(self) -> int:
+		# starts at 1, incremented after each move of black
+		plies = len(self._moves_.stack)
+		black_started = (self._turn == Player.BLACK) != (plies % 2 == 1)
+		return self._start_fullmove_number_ + (plies + black_started) // 2
+
+	def position(self) -> Tuple[str, List[str]]:
+		# Serialises the position as the starting position (FEN) and the moves made since (long algebraic notation).
+		# Refer `chess.from_position` to construct the chess object back (like in another process).
+		assert self._start_fen_, 'starting position is not known'
+		return self._start_fen_, [move.uci for move in self._moves_.stack]
+
+	def cache_info(self) -> CacheInfo:
+		# hits, misses and evictions of the cache of computed values
+		return self._cache_.info()
+
+	@Memoize.memoize
 	def __getitem__(self, item):
 		return self._board[item]
 
-	@cache.memoize
 	def _can_make_move_(self, move: Move):
 		# Checks if the given move can be made,
 		# move cannot be applied, if it will result in a check to the player's king
 		# that is, king cannot be captured by the enemy in the next move.
-		self._board.make_move(move)
+		self._board.make_move(move, update_hash=False)
 		will_check = self._kings[move.player].under_check()
-		self._board.undo_move(move)
+		self._board.undo_move(move, update_hash=False)
 		return not will_check
 
-	@cache.memoize
+	@Memoize.memoize
+	def _legal_moves_by_piece_(self) -> Dict[Piece, List[Move]]:
+		# Returns the valid moves of each piece of the player [current turn] which can move.
+		# Pinned pieces and check evasion are determined once (Refer `Board.checks_and_pins`),
+		# instead of applying each move and testing for check.
+		board, player = self._board, self._turn
+		king, enemy = self._kings[player], player.enemy
+		checkers, check_mask, pins, behind_king = board.checks_and_pins(king.square, player)
+		moves_by_piece = {}
+		for piece in board[player]:
+			if piece is king:  # king must not move to an attacked square (castling checks the squares it passes)
+				moves = [move for move in piece.possible_moves()
+						 if move.new_square not in behind_king and not board.is_attacked(move.new_square, enemy)]
+			elif len(checkers) > 1:  # double check, only the king can move
+				continue
+			else:
+				pinned_squares, moves = pins.get(piece), []
+				for move in piece.possible_moves():
+					if move.en_passant_pawn:  # removes two pawns from a rank (may uncover a check), so tested
+						if self._can_make_move_(move):
+							moves.append(move)
+					elif (not checkers or move.new_square in check_mask) and \
+							(pinned_squares is None or move.new_square in pinned_squares):
+						moves.append(move)
+			if moves:
+				moves_by_piece[piece] = moves
+		return moves_by_piece
+
 	def _possible_moves_(self, piece: Piece) -> List[Move]:
 		# returns valid moves the piece of the player [current turn] can make
-		return [move for move in piece.possible_moves() if self._can_make_move_(move)]
+		return self._legal_moves_by_piece_().get(piece, [])
+
+	def _is_legal_(self, move: Move) -> bool:
+		# Checks if the (pseudo-legal) move of the piece of the player [current turn] is valid
+		return any(other.new_square == move.new_square for other in self._possible_moves_(move.piece))
+
+	@Memoize.memoize
+	def legal_moves(self) -> List[Move]:
+		# returns all the valid moves the player [current turn] can make,
+		# pawn promotions are expanded into a move for each piece the pawn can be promoted to.
+		moves = []
+		for piece_moves in self._legal_moves_by_piece_().values():
+			for move in piece_moves:
+				if move.pawn_promoted:
+					moves.extend(Move.pawn_promotion(self._board, move.piece, move.new_square, piece_cls(self._turn, self._board))
+								 for piece_cls in PROMOTION_PIECES)
+				else:
+					moves.append(move)
+		return moves
 
 	# Broken get-move and broken-castle
-	@cache.memoize
+	@Memoize.memoize
 	def get_move(self, piece: Piece, new_square: Square) -> Move:
 		# returns the move to make if piece can move to new_square
 		assert piece.player == self._turn
@@ -70,7 +167,6 @@ class Chess:
 			if move.new_square == new_square:
 				return move
 
-	@cache.invalidate
 	def make_move(self, move: Move):
 		assert move.player == self._turn
 		# Either pawn is not promoted or if promoted new_piece MUST be specified
@@ -80,92 +176,190 @@ class Chess:
 			self._board.make_move(move)
 			self._moves_.push(move)
 			self._turn = self._turn.enemy
+			self._push_position_(move)
 
 	# History -- UNDO a move
-	@cache.invalidate
 	def undo_move(self):
 		move = self._moves_.back()
 		if move:
 			self._board.undo_move(move)
 			self._turn = self._turn.enemy
+			self._pop_position_()
 			return True
 
 	# History -- REDO a move
-	@cache.invalidate
 	def redo_move(self):
 		move = self._moves_.forward()
 		if move:
 			self._board.make_move(move)
 			self._turn = self._turn.enemy
+			self._push_position_(move)
 			return True
 
+	# Applies (and reverts) moves without computing notation, for walking the move tree (like in perft).
+	def push(self, move: Move):
+		self._board.make_move(move)
+		self._moves_.push(move)
+		self._turn = self._turn.enemy
+		self._push_position_(move)
+
+	def pop(self) -> Move:
+		move = self._moves_.back()
+		self._board.undo_move(move)
+		self._turn = self._turn.enemy
+		self._pop_position_()
+		return move
+
+	def _push_position_(self, move: Move):
+		# Records the position after the move (Refer draw detection)
+		hash_ = self.zobrist_hash
+		self._hashes_.append(hash_)
+		self._hash_counts_[hash_] += 1
+		irreversible = isinstance(move.piece, Pawn) or move.captured_piece
+		self._clocks_.append(0 if irreversible else self._clocks_[-1] + 1)
+		# material changes only with captures (and promotions)
+		self._insufficient_material_.append(self._has_insufficient_material_() if move.captured_piece or
+											move.pawn_promoted else self._insufficient_material_[-1])
+		self._statuses_.append(None)
+
+	def _pop_position_(self):
+		self._hash_counts_[self._hashes_.pop()] -= 1
+		self._clocks_.pop()
+		self._insufficient_material_.pop()
+		self._statuses_.pop()
+
 	################# CHESS STATUS -- CHECK, CHECKMATE and STALEMATE ###########################
-	@cache.memoize
+	def status(self) -> GameStatus:
+		# Computed once per position (when first needed) and kept till the move is undone.
+		status = self._statuses_[-1]
+		if status is None:
+			check, legal_moves = self._kings[self._turn].under_check(), len(self.legal_moves())
+			checkmate, stalemate = check and not legal_moves, not check and not legal_moves
+			draw = stalemate or self.is_insufficient_material() or self.is_fivefold_repetition() or \
+				   (self.is_seventy_five_moves() and not checkmate)
+			status = self._statuses_[-1] = GameStatus(check, checkmate, stalemate, draw, legal_moves)
+		return status
+
 	def is_check(self):
-		return self._kings[self.turn].under_check()
+		# (cheaper than computing the status, which needs the legal moves)
+		status = self._statuses_[-1]
+		return status.check if status is not None else self._kings[self._turn].under_check()
 
-	@cache.memoize
 	def is_checkmate(self):
-		if not self.is_check():
-			return False  # checkmate needs a check
-		for piece in self._board[self.turn]:
-			if self._possible_moves_(piece):  # If a piece can move, then not a checkmate
-				return False
-		return True
+		return self.status().checkmate
 
-	@cache.memoize
 	def is_stalemate(self):
-		if self.is_check():  # if under check, stalemate is note possible.
-			return False
-		for piece in self._board[self.turn]:
-			if self._possible_moves_(piece):  # If a piece can move, then not a stalemate
+		return self.status().stalemate
+
+	################# DRAWS -- REPETITION, FIFTY MOVES and INSUFFICIENT MATERIAL ##################
+	def repetitions(self) -> int:
+		# number of times the current position has occurred (including now)
+		return self._hash_counts_[self._hashes_[-1]]
+
+	def is_threefold_repetition(self) -> bool:  # draw can be claimed
+		return self.repetitions() >= 3
+
+	def is_fivefold_repetition(self) -> bool:  # draw
+		return self.repetitions() >= 5
+
+	def is_fifty_moves(self) -> bool:  # draw can be claimed, fifty moves (by each player) without capture or pawn move
+		return self._clocks_[-1] >= 100
+
+	def is_seventy_five_moves(self) -> bool:  # draw (unless the last move checkmates)
+		return self._clocks_[-1] >= 150
+
+	def is_insufficient_material(self) -> bool:  # draw, neither player can checkmate
+		return self._insufficient_material_[-1]
+
+	def is_draw(self) -> bool:
+		# draws which end the game (without a claim) -- stalemate, insufficient material, fivefold repetition
+		# and seventy-five moves (unless the last move checkmates)
+		return self.status().draw
+
+	def can_claim_draw(self) -> bool:
+		return self.is_threefold_repetition() or self.is_fifty_moves()
+
+	def _has_insufficient_material_(self) -> bool:
+		# Only kings, a king and a minor piece against a king, or only bishops on squares of the same color
+		knights, bishop_colors = 0, []
+		for piece in self._board[Player.WHITE] + self._board[Player.BLACK]:
+			if isinstance(piece, (Pawn, Rook, Queen)):
 				return False
-		return True
+			if isinstance(piece, Knight):
+				knights += 1
+			elif isinstance(piece, Bishop):
+				bishop_colors.append(sum(piece.square) % 2)
+		return knights + len(bishop_colors) <= 1 or (not knights and len(set(bishop_colors)) == 1)
 
 	def __repr__(self):
 		return 'Chess(<board>, <player_turn>, <move_history>)'
 
 	################## UI FUNCTIONS	#######################################
-	def draw(self, win: Surface, small_font: Font):
-		self._board.draw(win, small_font)
+	def square_states(self) -> Dict[Square, Tuple]:
+		# Returns what each square shows -- (piece type and player or None, highlights (Refer `Board.draw_square`))
+		# Compared between frames to redraw only the squares which changed (Refer `chess.renderer`)
+		highlights = {square: [] for square in ALL_SQUARES}
 		if self._selected_piece:
-			self._board.highlight_circle(win, self._selected_piece.square, (255, 0, 0))
+			highlights[self._selected_piece.square].append(('circle', (255, 0, 0), 128, 0, 1.0))
 			for move in self._possible_moves_(self._selected_piece):
 				if move.captured_piece or move.en_passant_pawn:
-					self._board.highlight_circle(win, move.new_square, (0, 0, 255), rf=0.8)
+					highlights[move.new_square].append(('circle', (0, 0, 255), 128, 0, 0.8))
 				else:
-					self._board.highlight_circle(win, move.new_square, (0, 255, 0), rf=0.8)
+					highlights[move.new_square].append(('circle', (0, 255, 0), 128, 0, 0.8))
 		last_move = self._moves_.top()
 		if last_move:
-			self._board.highlight_square(win, last_move.old_square, (255, 0, 0), 128, width=5)
-			self._board.highlight_square(win, last_move.new_square, (255, 0, 0), 128, width=5)
+			highlights[last_move.old_square].append(('square', (255, 0, 0), 128, 5, 1.0))
+			highlights[last_move.new_square].append(('square', (255, 0, 0), 128, 5, 1.0))
+		board, states = self._board, {}
+		for square in ALL_SQUARES:
+			piece = board[square]
+			states[square] = ((type(piece), piece.player) if piece else None, tuple(highlights[square]))
+		return states
+
+	def status_texts(self) -> Tuple[str, str]:
+		# Returns the player to move and the status (CHECK, CHECKMATE, STALEMATE, DRAW or none) shown
+		if self.is_checkmate():
+			state = "CHECKMATE!"
+		elif self.is_stalemate():
+			state = "STALEMATE!"
+		elif self.is_draw():
+			state = "DRAW!"
+		elif self.is_check():
+			state = "CHECK!"
+		else:
+			state = None
+		return f"{self._turn}", state
 
-		for piece in self._board[self._turn]:
-			piece.draw(win)
-		for piece in self._board[self._turn.enemy]:
-			piece.draw(win)
+	@property
+	def promotion_player(self) -> Player:
+		# player choosing the piece to promote to (promotion menu is shown), if any
+		return self._promotion_move.player if self._promotion_move else None
 
+	def draw(self, win: Surface, small_font: Font):
+		self._board.draw(win, small_font)
+		for square, state in self.square_states().items():
+			self.draw_square(win, square, state)
 		if self._promotion_move:
 			draw_promotion_menu(win, self._promotion_move.player)
 
+	@staticmethod
+	def draw_square(win: Surface, square: Square, state: Tuple):
+		# state -- Refer `square_states`
+		piece, highlights = state
+		Board.draw_square(win, square, piece[0].IMG[piece[1]] if piece else None, highlights)
+
 	# Draws the status (CHECK, CHECKMATE or STALEMATE?) of the game!
 	def draw_status(self, win: Surface, small_font: Font):
 		status_rect = pygame.Rect(STATUS_RECT)
 		pygame.draw.rect(win, (255, 255, 255), status_rect)
-		turn_surf: Surface = small_font.render(f"{self._turn}", True, (0, 0, 0))
+		turn, state = self.status_texts()
+		turn_surf: Surface = small_font.render(turn, True, (0, 0, 0))
 		turn_rect: pygame.Rect = turn_surf.get_rect()
 		turn_rect.midleft = status_rect.midleft
 		win.blit(turn_surf, turn_rect)
 
-		state_surf: Surface = None
-		if self.is_checkmate():
-			state_surf = small_font.render(f"CHECKMATE!", True, (0, 0, 0))
-		elif self.is_check():
-			state_surf = small_font.render(f"CHECK!", True, (0, 0, 0))
-		elif self.is_stalemate():
-			state_surf = small_font.render(f"STALEMATE!", True, (0, 0, 0))
-
-		if state_surf:
+		if state:
+			state_surf: Surface = small_font.render(state, True, (0, 0, 0))
 			state_rect: pygame.Rect = state_surf.get_rect()
 			state_rect.midright = status_rect.midright
 			win.blit(state_surf, state_rect)
@@ -174,15 +368,15 @@ class Chess:
 		if self._promotion_move:
 			return
 
-		if key == K_LEFT:
+		if key == pygame.K_LEFT:
 			if self.undo_move():
 				self._selected_piece = None
 
-		elif key == K_RIGHT:
+		elif key == pygame.K_RIGHT:
 			if self.redo_move():
 				self._selected_piece = None
 
-		elif key == K_s:  # save moves to file `moves.txt`
+		elif key == pygame.K_s:  # save moves to file `moves.txt`
 			file_name = 'moves.txt'
 			print(f'Saving moves to {file_name}')
 			write_notations(self._moves_.stack, file_name)
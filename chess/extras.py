@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from board import Board
+from board import BACKENDS
 from chess import Chess
+from .fen import INITIAL_FEN
 from pieces import King, Queen, Rook, Bishop, Knight, Pawn
 from utils import Player, Square, History
 
@@ -45,10 +46,12 @@ INITIAL_POSITIONS = [
 ]
 
 
-def from_initial():
+def from_initial(backend: str = 'dict', cache_size: int = 4096):
 	# Returns a chess object with pieces at their initial positions
+	# backend -- board implementation to use, one of `board.BACKENDS` ('dict' or 'bitboard')
+	# cache_size -- maximum number of computed values (like possible moves) cached by the chess object
 	history_stack = History()
-	board = Board(history_stack)
+	board = BACKENDS[backend](history_stack)
 	for piece_cls, player, square in INITIAL_POSITIONS:
 		board.add(piece_cls(player, board), square)
-	return Chess(board, Player.WHITE, history_stack)
+	return Chess(board, Player.WHITE, history_stack, cache_size, start_fen=INITIAL_FEN)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+from board import BACKENDS
+from pieces import King, Queen, Rook, Bishop, Knight, Pawn
+from utils import Player, Square, History, Move
+from .chess import Chess
+
+if TYPE_CHECKING:
+	from board import Board
+
+"""
+Forsyth-Edwards Notation (FEN) describes a position in a single line.
+Example (initial position): `rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1`
+Fields are piece placement (from rank 8 to 1, white pieces in upper case), player to move,
+castling rights, en-passant square, half-move clock and full-move number.
+"""
+
+INITIAL_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+FEN_PIECES = {'k': King, 'q': Queen, 'r': Rook, 'b': Bishop, 'n': Knight, 'p': Pawn}
+FEN_PLAYERS = {'w': Player.WHITE, 'b': Player.BLACK}
+FEN_NOTATIONS = {piece_cls: notation for notation, piece_cls in FEN_PIECES.items()}
+
+# Castling right -> (player, king square, rook square)
+CASTLING_RIGHTS = {
+	'K': (Player.WHITE, Square(4, 7), Square(7, 7)),
+	'Q': (Player.WHITE, Square(4, 7), Square(0, 7)),
+	'k': (Player.BLACK, Square(4, 0), Square(7, 0)),
+	'q': (Player.BLACK, Square(4, 0), Square(0, 0)),
+}
+PAWN_INITIAL_RANK = {Player.WHITE: 6, Player.BLACK: 1}
+
+
+def from_fen(fen: str, backend: str = 'dict', cache_size: int = 4096) -> Chess:
+	# Returns a chess object with the position described by the FEN.
+	# Move clocks are optional (default `0 1`). Raises ValueError if the FEN is malformed.
+	fields = fen.split()
+	if len(fields) not in (4, 6):
+		raise ValueError(f'Expected 4 or 6 fields. Cannot parse FEN {fen}.')
+	placement, turn, castling, en_passant = fields[:4]
+	halfmove_clock, fullmove_number = fields[4:] or ('0', '1')
+	ranks = placement.split('/')
+	if len(ranks) != 8 or turn not in FEN_PLAYERS or not halfmove_clock.isdigit() or not fullmove_number.isdigit() \
+			or (castling != '-' and not all(right in CASTLING_RIGHTS for right in castling)):
+		raise ValueError(f'Cannot parse FEN {fen}.')
+
+	# Kings and rooks that cannot castle, and pawns not on the initial rank have moved.
+	unmoved_squares = set()
+	for right in castling.replace('-', ''):
+		_, king_square, rook_square = CASTLING_RIGHTS[right]
+		unmoved_squares.update((king_square, rook_square))
+
+	history_stack = History()
+	board = BACKENDS[backend](history_stack)
+	for y, rank in enumerate(ranks):
+		x = 0
+		for char in rank:
+			if char.isdigit():
+				x += int(char)
+				continue
+			if char.lower() not in FEN_PIECES or x > 7:
+				raise ValueError(f'Invalid rank {rank}. Cannot parse FEN {fen}.')
+			square, piece_cls = Square(x, y), FEN_PIECES[char.lower()]
+			player = Player.WHITE if char.isupper() else Player.BLACK
+			if piece_cls in (King, Rook):
+				moved = square not in unmoved_squares
+			elif piece_cls is Pawn:
+				moved = y != PAWN_INITIAL_RANK[player]
+			else:
+				moved = None
+			board.add(piece_cls(player, board), square, moved=moved)
+			x += 1
+		if x != 8:
+			raise ValueError(f'Invalid rank {rank}. Cannot parse FEN {fen}.')
+	for player in (Player.WHITE, Player.BLACK):
+		if len(board[King][player]) != 1:
+			raise ValueError(f'Expected one king of {player}. Cannot parse FEN {fen}.')
+
+	if en_passant != '-':
+		# The last move was the enemy pawn's two square move over the en-passant square, pawns use it for en-passant.
+		board.set_previous_move(_two_square_pawn_move(board, FEN_PLAYERS[turn].enemy, en_passant, fen))
+	return Chess(board, FEN_PLAYERS[turn], history_stack, cache_size, start_fen=fen,
+				 halfmove_clock=int(halfmove_clock), fullmove_number=int(fullmove_number))
+
+
+def _two_square_pawn_move(board: Board, player: Player, en_passant: str, fen: str) -> Move:
+	# Reconstructs the two square pawn move (of the player) passing over the en-passant square.
+	if len(en_passant) != 2 or en_passant[0] not in 'abcdefgh' or en_passant[1] != ('3' if player == Player.WHITE else '6'):
+		raise ValueError(f'Invalid en-passant square {en_passant}. Cannot parse FEN {fen}.')
+	x = ord(en_passant[0]) - ord('a')
+	old_square, new_square = (Square(x, 6), Square(x, 4)) if player == Player.WHITE else (Square(x, 1), Square(x, 3))
+	pawn = board[new_square]
+	if not isinstance(pawn, Pawn) or pawn.player != player or board[old_square] is not None:
+		raise ValueError(f'No pawn moved over en-passant square {en_passant}. Cannot parse FEN {fen}.')
+	return Move(player, pawn, old_square, new_square, piece_moved=False)
+
+
+def to_fen(chess: Chess) -> str:
+	# Returns the FEN of the current position of the chess object.
+	board, ranks = chess.board, []
+	for y in range(8):
+		rank, empty = '', 0
+		for x in range(8):
+			piece = board[Square(x, y)]
+			if piece is None:
+				empty += 1
+				continue
+			notation = FEN_NOTATIONS[type(piece)]
+			rank += (str(empty) if empty else '') + (notation.upper() if piece.player == Player.WHITE else notation)
+			empty = 0
+		ranks.append(rank + (str(empty) if empty else ''))
+
+	castling = ''
+	for right, (player, king_square, rook_square) in CASTLING_RIGHTS.items():
+		king, rook = board[king_square], board[rook_square]
+		if isinstance(king, King) and king.player == player and not board.moved(king) and \
+				isinstance(rook, Rook) and rook.player == player and not board.moved(rook):
+			castling += right
+
+	# En-passant square is recorded after any two square pawn move (even if no pawn can capture)
+	en_passant, last_move = '-', board.last_move
+	if last_move and isinstance(last_move.piece, Pawn) and abs(last_move.new_square.y - last_move.old_square.y) == 2:
+		x, y = last_move.new_square
+		en_passant = f'{"abcdefgh"[x]}{8 - (y + last_move.old_square.y) // 2}'
+
+	turn = 'w' if chess.turn == Player.WHITE else 'b'
+	return f'{"/".join(ranks)} {turn} {castling or "-"} {en_passant} {chess.halfmove_clock} {chess.fullmove_number}'
+
+
+def from_position(fen: str, moves: List[str], backend: str = 'dict', cache_size: int = 4096) -> Chess:
+	# Returns a chess object with the position after making the moves (long algebraic notation) from the FEN.
+	# Refer `Chess.position`, moves are made without computing their notation.
+	chess_instance = from_fen(fen, backend, cache_size)
+	for notation in moves:
+		chess_instance.push(Move.from_uci(notation, chess_instance))
+	return chess_instance
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Tuple, Type
 
-import pygame
-
 from constants import PROMOTION_MODAL_RECT, PROMOTION_MODAL_COLOR, PROMOTION_QUEEN_RECT, PROMOTION_ROOK_RECT, \
 	PROMOTION_BISHOP_RECT, PROMOTION_KNIGHT_RECT
 from pieces import Queen, Rook, Bishop, Knight
+from utils import lazy_import
+
+pygame = lazy_import('pygame')
 
 if TYPE_CHECKING:
 	from pygame import Surface
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from constants import BOARD_LEFT, BOARD_TOP, SQUARE, STATUS_RECT, WIN_WIDTH, WIN_HEIGHT
+from utils import Square, lazy_import
+
+pygame = lazy_import('pygame')
+
+if TYPE_CHECKING:
+	from pygame import Surface
+	from pygame.font import Font
+	from .chess import Chess
+
+"""
+Retained mode rendering, remembers what was drawn on the window and redraws only the squares
+(and status) which changed since, returning the changed areas (dirty rectangles) to update on the display.
+"""
+
+
+class Renderer:
+	def __init__(self, win: Surface, small_font: Font):
+		self._win = win
+		self._small_font = small_font
+		self._square_states_: Dict[Square, Tuple] = None  # drawn state of each square, None if nothing drawn
+		self._status_texts_: Tuple[str, str] = None
+		self._promotion_player_ = None
+
+	def invalidate(self):
+		# Redraws everything on the next render (like when the window is exposed)
+		self._square_states_ = None
+
+	def render(self, chess: Chess) -> List[pygame.Rect]:
+		# Draws the changes since the last render, returns the areas (of the window) changed
+		square_states, status_texts = chess.square_states(), chess.status_texts()
+		promotion_player = chess.promotion_player
+		if self._square_states_ is None or promotion_player != self._promotion_player_:
+			# everything (the promotion menu covers squares)
+			chess.draw(self._win, self._small_font)
+			chess.draw_status(self._win, self._small_font)
+			dirty_rects = [pygame.Rect(0, 0, WIN_WIDTH, WIN_HEIGHT)]
+		else:
+			dirty_rects = []
+			for square, state in square_states.items():
+				if state != self._square_states_[square]:
+					chess.draw_square(self._win, square, state)
+					dirty_rects.append(pygame.Rect(BOARD_LEFT + square.x * SQUARE, BOARD_TOP + square.y * SQUARE,
+												   SQUARE, SQUARE))
+			if status_texts != self._status_texts_:
+				chess.draw_status(self._win, self._small_font)
+				dirty_rects.append(pygame.Rect(STATUS_RECT))
+		self._square_states_, self._status_texts_ = square_states, status_texts
+		self._promotion_player_ = promotion_player
+		return dirty_rects
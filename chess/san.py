@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, List, Type
+
+from pieces import Piece, King, Queen, Rook, Bishop, Knight, Pawn
+from pieces.tables import KNIGHT_SQUARES, KING_SQUARES, PAWN_ATTACK_SQUARES, BISHOP_RAYS, ROOK_RAYS, QUEEN_RAYS
+from utils import Player, Square, Move, IllegalMoveError, AmbiguousMoveError
+
+if TYPE_CHECKING:
+	from board import Board
+	from .chess import Chess
+
+"""
+Standard algebraic notation (SAN) of moves, like `Nf3`, `exd5`, `O-O`, `e8=Q+` or `Rad1`.
+Pieces which can move to the destination square are found by looking outwards from the square
+(like the reverse of the attack tables), instead of generating the moves of every piece of the type.
+"""
+
+SAN_PATTERN = re.compile(r'^(?P<piece>[NBRQK])?(?P<file>[a-h])?(?P<rank>[1-8])?(?P<captured>x)?'
+						 r'(?P<square>[a-h][1-8])(=(?P<promoted>[NBRQ]))?(?P<enpassant>\(ep\))?[+#]?$')
+CASTLE_PATTERN = re.compile(r'^O-O(?P<queen_side>-O)?[+#]?$')
+
+SAN_PIECES = {'K': King, 'Q': Queen, 'R': Rook, 'B': Bishop, 'N': Knight, None: Pawn}
+SLIDER_RAYS = {Queen: QUEEN_RAYS, Rook: ROOK_RAYS, Bishop: BISHOP_RAYS}
+PAWN_DIRECTION = {Player.WHITE: -1, Player.BLACK: 1}  # change in y when pawn moves forward
+PAWN_TWO_SQUARE_RANK = {Player.WHITE: 4, Player.BLACK: 3}  # y of the pawn after its two square move
+PROMOTION_RANK = {Player.WHITE: 0, Player.BLACK: 7}
+
+
+def candidate_moves(board: Board, piece_cls: Type[Piece], player: Player, square: Square,
+					new_piece_cls: Type[Piece] = None) -> List[Move]:
+	# Returns the moves (without considering check) of the player's pieces of the type to the square.
+	# Castling is not included. new_piece_cls -- piece a pawn reaching the last rank is promoted to (if known)
+	occupant = board[square]
+	if occupant is not None and occupant.player == player:
+		return []
+	if piece_cls is Pawn:
+		return _pawn_moves_(board, player, square, occupant, new_piece_cls)
+
+	if piece_cls is Knight or piece_cls is King:
+		squares = KNIGHT_SQUARES[square] if piece_cls is Knight else KING_SQUARES[square]
+		pieces = [board[other] for other in squares]
+	else:  # the first piece along each ray from the square
+		pieces = []
+		for ray in SLIDER_RAYS[piece_cls][square]:
+			for other in ray:
+				piece = board[other]
+				if piece is not None:
+					pieces.append(piece)
+					break
+	return [Move.typical(board, piece, square) for piece in pieces
+			if type(piece) is piece_cls and piece.player == player]
+
+
+def _pawn_moves_(board: Board, player: Player, square: Square, occupant: Piece, new_piece_cls: Type[Piece]):
+	pawns, x, y = [], square.x, square.y
+	if occupant is None:  # pawn pushes (or en-passant)
+		behind = board[Square(x, y - PAWN_DIRECTION[player])]
+		if behind is None and y == PAWN_TWO_SQUARE_RANK[player]:
+			behind = board[Square(x, y - 2 * PAWN_DIRECTION[player])]
+		if isinstance(behind, Pawn) and behind.player == player:
+			pawns.append(behind)
+	moves = []
+	for other in PAWN_ATTACK_SQUARES[player.enemy][square]:  # squares from where player's pawn attacks the square
+		pawn = board[other]
+		if isinstance(pawn, Pawn) and pawn.player == player:
+			if occupant is not None:
+				pawns.append(pawn)
+			else:
+				en_passant = pawn.en_passant()
+				if en_passant and en_passant.new_square == square:
+					moves.append(en_passant)
+	if y == PROMOTION_RANK[player]:
+		return [Move.pawn_promotion(board, pawn, square, new_piece_cls(player, board) if new_piece_cls else None)
+				for pawn in pawns]
+	return [Move.typical(board, pawn, square) for pawn in pawns] + moves
+
+
+def from_san(notation: str, chess: Chess, strict: bool = False) -> Move:
+	# Returns the move of the notation.
+	# Unless strict, the move is checked (for leaving the king in check) only when more than one piece can make it.
+	# strict -- raises IllegalMoveError if the move cannot be made and AmbiguousMoveError if more than one piece can.
+	board, player = chess.board, chess.turn
+	match = CASTLE_PATTERN.match(notation)
+	if match:
+		king = chess[King][player][0]
+		move = king.queen_side_castle() if match.group('queen_side') else king.king_side_castle()
+		if not move or (strict and not chess._is_legal_(move)):
+			raise IllegalMoveError(f'Cannot castle. Cannot make move {notation}.')
+		return move
+
+	match = SAN_PATTERN.match(notation)
+	if not match:
+		raise NotImplementedError(f'Unknown Notation. Cannot parse notation {notation}.')
+	piece_cls, promoted = SAN_PIECES[match.group('piece')], match.group('promoted')
+	square_notation, file, rank = match.group('square'), match.group('file'), match.group('rank')
+	square = Square(ord(square_notation[0]) - 97, 8 - int(square_notation[1]))
+	moves = candidate_moves(board, piece_cls, player, square, SAN_PIECES[promoted] if promoted else None)
+	if file or rank:
+		moves = [move for move in moves if (not file or move.old_square.x == ord(file) - 97) and
+				 (not rank or move.old_square.y == 8 - int(rank))]
+	if strict:
+		if moves and bool(moves[0].pawn_promoted) != bool(promoted):  # promotion must (only) be on the last rank
+			moves = []
+		moves = [move for move in moves if chess._is_legal_(move)]
+	elif len(moves) > 1:  # pieces which cannot move (like pinned), do not make the notation ambiguous
+		moves = [move for move in moves if chess._is_legal_(move)]
+	if len(moves) == 1:
+		return moves[0]
+	if moves:
+		raise AmbiguousMoveError(f'{len(moves)} pieces can make move {notation}.')
+	raise IllegalMoveError(f'No piece can make move {notation}.')
+
+
+def to_san(move: Move, chess: Chess, indicate_enpassant: bool = False) -> str:
+	# Returns the notation of the move (before it is made), without check or checkmate indication.
+	if move.castle_rook:
+		return 'O-O' if move.new_square.x == 6 else 'O-O-O'
+	piece, new_square = move.piece, move.new_square
+	n_captured = 'x' if move.captured_piece or move.en_passant_pawn else ''
+	n_promoted = f'={move.new_piece.notation}' if move.pawn_promoted else ''
+	n_enpassant = '(ep)' if indicate_enpassant and move.en_passant_pawn else ''
+	if isinstance(piece, Pawn):  # if pawn captures a piece, specify file
+		n_piece = move.old_square.notation[0] if n_captured else ''
+		return f'{n_piece}{n_captured}{new_square.notation}{n_promoted}{n_enpassant}'
+
+	# if other pieces of the same type can move to the same square, the file (or rank, or both) of the piece is used
+	n_ambiguity = ''
+	others = [other.old_square for other in candidate_moves(chess.board, type(piece), move.player, new_square)
+			  if other.piece is not piece and chess._is_legal_(other)]
+	if others:
+		old_square = move.old_square
+		if all(other.x != old_square.x for other in others):
+			n_ambiguity = old_square.notation[0]
+		elif all(other.y != old_square.y for other in others):
+			n_ambiguity = old_square.notation[1]
+		else:
+			n_ambiguity = old_square.notation
+	return f'{piece.notation}{n_ambiguity}{n_captured}{new_square.notation}{n_promoted}{n_enpassant}'
@@ -0,0 +1,5 @@
+from .evaluate import evaluate, PIECE_VALUES
+from .search import Engine, SearchResult, SearchStopped, MATE_SCORE
+from .transposition import TranspositionTable, TTEntry, encode_move, EXACT, LOWER_BOUND, UPPER_BOUND
+from .parallel import ParallelEngine
+from .book import OpeningBook, build_book
@@ -0,0 +1,38 @@
+import argparse
+
+import chess
+from engine import Engine, ParallelEngine, SearchResult
+
+"""
+Searches a position and prints the progress of each depth.
+python -m engine --fen "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3" --movetime 10
+"""
+
+
+def print_info(result: SearchResult):
+	score = f'mate {result.mate_in}' if result.mate_in is not None else f'cp {result.score}'
+	print(f'depth {result.depth} score {score} nodes {result.nodes} nps {result.nps} '
+		  f'time {result.elapsed:.2f}s pv {" ".join(move.uci for move in result.pv)}')
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--fen', default=chess.INITIAL_FEN, help='position to search. default initial position')
+	parser.add_argument('--depth', default=None, type=int, help='maximum depth (plies) to search')
+	parser.add_argument('--movetime', default=5.0, type=float, help='time limit (in seconds). default `5`')
+	parser.add_argument('--nodes', default=None, type=int, help='maximum nodes to search')
+	parser.add_argument('--hash', default=16, type=float, help='transposition table size (in MB). default `16`')
+	parser.add_argument('--workers', default=None, type=int,
+						help='search the root moves in parallel across the number of processes')
+	args = parser.parse_args()
+
+	if args.workers:
+		with ParallelEngine(args.workers, args.hash) as engine:
+			result = engine.search(chess.from_fen(args.fen), args.depth, args.movetime, info=print_info)
+	else:
+		engine = Engine(chess.from_fen(args.fen), args.hash)
+		result = engine.search(args.depth, args.movetime, args.nodes, info=print_info)
+	print(f'bestmove {result.move.uci if result.move else "(none)"} depth {result.depth} '
+		  f'nodes {result.nodes} nps {result.nps}')
+	if not args.workers:
+		print(f'transposition table {engine.tt.info()} hit rate {engine.tt.hit_rate:.1%} hashfull {engine.tt.hashfull}')
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import mmap
+import os
+import random
+import struct
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+import chess
+from utils import Move, read_pgn
+
+if TYPE_CHECKING:
+	from chess import Chess
+
+"""
+Opening book, moves (with weights) of positions from a corpus of games, stored in a compact binary file.
+Like Polyglot books, records are 16 bytes (big endian) -- position key (64 bits), move (16 bits), weight (16 bits)
+and learn (32 bits, unused) -- sorted by key (moves of a position by weight, highest first).
+Keys are the zobrist hashes of the positions (Refer `Chess.zobrist_hash`) and moves are packed (Refer `Move.code`),
+so books of other programs cannot be read.
+The file is memory mapped and searched (binary search), nothing is read or parsed when it is opened.
+
+Refer `book.py` (project root) to build a book from PGN archives and probe positions.
+"""
+
+RECORD = struct.Struct('>QHHI')  # key, move, weight, learn
+KEY = struct.Struct('>Q')
+MAX_WEIGHT = 0xFFFF
+
+
+class OpeningBook:
+	def __init__(self, file: str):
+		self._file = open(file, 'rb')
+		size = os.fstat(self._file.fileno()).st_size
+		# an empty file cannot be memory mapped (and has no records)
+		self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+		self.entries = size // RECORD.size
+
+	def _key_(self, index: int) -> int:
+		return KEY.unpack_from(self._data, index * RECORD.size)[0]
+
+	def entries_of(self, key: int) -> List[Tuple[int, int]]:
+		# Returns the (packed) moves and weights of the position key, by binary search for its first record
+		low, high = 0, self.entries
+		while low < high:
+			middle = (low + high) // 2
+			if self._key_(middle) < key:
+				low = middle + 1
+			else:
+				high = middle
+		entries = []
+		for index in range(low, self.entries):
+			record_key, code, weight, _ = RECORD.unpack_from(self._data, index * RECORD.size)
+			if record_key != key:
+				break
+			entries.append((code, weight))
+		return entries
+
+	def moves(self, chess_instance: Chess) -> List[Tuple[Move, int]]:
+		# Returns the book moves (and weights) of the current position, highest weight first
+		moves = []
+		for code, weight in self.entries_of(chess_instance.zobrist_hash):
+			try:
+				moves.append((Move.from_code(code, chess_instance), weight))
+			except NotImplementedError:  # not legal in the position (different position with the same key)
+				continue
+		return moves
+
+	def choose(self, chess_instance: Chess, rng: random.Random = None) -> Optional[Move]:
+		# Returns a book move chosen randomly in proportion to the weights, None if the position is not in the book
+		moves = [(move, weight) for move, weight in self.moves(chess_instance) if weight]
+		if not moves:
+			return None
+		return (rng or random).choices([move for move, _ in moves], [weight for _, weight in moves])[0]
+
+	def close(self):
+		if isinstance(self._data, mmap.mmap):
+			self._data.close()
+		self._file.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *_):
+		self.close()
+
+
+def build_book(pgn_files: Iterable[str], book_file: str, plies: int = 16, min_count: int = 2) -> Tuple[int, int]:
+	# Replays the first plies of the games, writes the moves played at least min_count times from each position.
+	# Games with a `FEN` tag pair are replayed from that position (skipped if it is invalid).
+	# Weights are the number of times played (scaled down if more than 16 bits). Returns the games and records.
+	counts, games = Counter(), 0
+	for pgn_file in pgn_files:
+		for game in read_pgn(pgn_file):
+			fen = game.headers.get('FEN')
+			try:
+				chess_instance = chess.from_fen(fen) if fen else chess.from_initial()
+			except ValueError:
+				continue
+			for notation in game.moves[:plies]:
+				try:
+					move = Move.from_notation(notation, chess_instance, strict=True)
+				except NotImplementedError:  # illegal, ambiguous or unknown notation, rest of the game is skipped
+					break
+				counts[chess_instance.zobrist_hash, move.code] += 1
+				chess_instance.push(move)
+			games += 1
+
+	entries = [(key, code, count) for (key, code), count in counts.items() if count >= min_count]
+	entries.sort(key=lambda entry: (entry[0], -entry[2]))
+	highest = max((count for _, _, count in entries), default=0)
+	scale = MAX_WEIGHT / highest if highest > MAX_WEIGHT else 1
+	with open(book_file, 'wb') as f:
+		for key, code, count in entries:
+			f.write(RECORD.pack(key, code, max(1, int(count * scale)), 0))
+	return games, len(entries)
+
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pieces import King, Queen, Rook, Bishop, Knight, Pawn
+from utils import Player
+
+if TYPE_CHECKING:
+	from chess import Chess
+
+"""
+Static evaluation of a position, material and piece-square tables
+(Refer https://www.chessprogramming.org/Simplified_Evaluation_Function).
+Tables are from white's point of view, indexed [y][x] (first row is the 8th rank), mirrored for black.
+"""
+
+PIECE_VALUES = {King: 0, Queen: 900, Rook: 500, Bishop: 330, Knight: 320, Pawn: 100}
+
+PIECE_SQUARE_TABLES = {
+	Pawn: (
+		(0, 0, 0, 0, 0, 0, 0, 0),
+		(50, 50, 50, 50, 50, 50, 50, 50),
+		(10, 10, 20, 30, 30, 20, 10, 10),
+		(5, 5, 10, 25, 25, 10, 5, 5),
+		(0, 0, 0, 20, 20, 0, 0, 0),
+		(5, -5, -10, 0, 0, -10, -5, 5),
+		(5, 10, 10, -20, -20, 10, 10, 5),
+		(0, 0, 0, 0, 0, 0, 0, 0),
+	),
+	Knight: (
+		(-50, -40, -30, -30, -30, -30, -40, -50),
+		(-40, -20, 0, 0, 0, 0, -20, -40),
+		(-30, 0, 10, 15, 15, 10, 0, -30),
+		(-30, 5, 15, 20, 20, 15, 5, -30),
+		(-30, 0, 15, 20, 20, 15, 0, -30),
+		(-30, 5, 10, 15, 15, 10, 5, -30),
+		(-40, -20, 0, 5, 5, 0, -20, -40),
+		(-50, -40, -30, -30, -30, -30, -40, -50),
+	),
+	Bishop: (
+		(-20, -10, -10, -10, -10, -10, -10, -20),
+		(-10, 0, 0, 0, 0, 0, 0, -10),
+		(-10, 0, 5, 10, 10, 5, 0, -10),
+		(-10, 5, 5, 10, 10, 5, 5, -10),
+		(-10, 0, 10, 10, 10, 10, 0, -10),
+		(-10, 10, 10, 10, 10, 10, 10, -10),
+		(-10, 5, 0, 0, 0, 0, 5, -10),
+		(-20, -10, -10, -10, -10, -10, -10, -20),
+	),
+	Rook: (
+		(0, 0, 0, 0, 0, 0, 0, 0),
+		(5, 10, 10, 10, 10, 10, 10, 5),
+		(-5, 0, 0, 0, 0, 0, 0, -5),
+		(-5, 0, 0, 0, 0, 0, 0, -5),
+		(-5, 0, 0, 0, 0, 0, 0, -5),
+		(-5, 0, 0, 0, 0, 0, 0, -5),
+		(-5, 0, 0, 0, 0, 0, 0, -5),
+		(0, 0, 0, 5, 5, 0, 0, 0),
+	),
+	Queen: (
+		(-20, -10, -10, -5, -5, -10, -10, -20),
+		(-10, 0, 0, 0, 0, 0, 0, -10),
+		(-10, 0, 5, 5, 5, 5, 0, -10),
+		(-5, 0, 5, 5, 5, 5, 0, -5),
+		(0, 0, 5, 5, 5, 5, 0, -5),
+		(-10, 5, 5, 5, 5, 5, 0, -10),
+		(-10, 0, 5, 0, 0, 0, 0, -10),
+		(-20, -10, -10, -5, -5, -10, -10, -20),
+	),
+	King: (
+		(-30, -40, -40, -50, -50, -40, -40, -30),
+		(-30, -40, -40, -50, -50, -40, -40, -30),
+		(-30, -40, -40, -50, -50, -40, -40, -30),
+		(-30, -40, -40, -50, -50, -40, -40, -30),
+		(-20, -30, -30, -40, -40, -30, -30, -20),
+		(-10, -20, -20, -20, -20, -20, -20, -10),
+		(20, 20, 0, 0, 0, 0, 20, 20),
+		(20, 30, 10, 0, 0, 10, 30, 20),
+	),
+}
+
+
+def evaluate(chess: Chess) -> int:
+	# Returns the score (in centi-pawns) of the position from the point of view of the player to move.
+	board, score = chess.board, 0
+	for player, sign in ((Player.WHITE, 1), (Player.BLACK, -1)):
+		for piece in board[player]:
+			x, y = piece.square
+			piece_cls = type(piece)
+			row = y if player == Player.WHITE else 7 - y
+			score += sign * (PIECE_VALUES[piece_cls] + PIECE_SQUARE_TABLES[piece_cls][row][x])
+	return score if chess.turn == Player.WHITE else -score
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import chess as chess_
+from utils import Move
+from .search import Engine, SearchResult, MATE_SCORE, MAX_PLY, INFINITY
+from .transposition import TranspositionTable
+
+if TYPE_CHECKING:
+	from chess import Chess
+
+"""
+Root split search across processes, deepening one ply at a time. At each depth the best root move (of the previous
+depth) is searched first, then the other root moves are searched in parallel with a null window at its score
+(young brothers wait), which only proves them worse. Moves proven better are searched again with the window
+above the best score. Workers search the position after the root move one ply shallower (without iterative deepening),
+they share the transposition table (in shared memory), which orders the moves from the previous depth.
+Workers construct the position from its serialised form (Refer `Chess.position`) instead of unpickling board objects,
+and keep the position and its engine (killer moves and history) between tasks of the same position.
+"""
+
+Position = Tuple[str, List[str]]  # starting position (FEN) and moves (long algebraic notation)
+
+# Per worker process -- shared transposition table, position (serialised) and the chess object and engine searching it
+_worker_state = {'tt': None, 'position': None, 'chess': None, 'engine': None}
+
+
+def _init_worker(tt_name: str, hash_mb: float):
+	_worker_state['tt'] = TranspositionTable.shared(hash_mb, tt_name)
+
+
+def _worker_engine(position: Position) -> Tuple[Chess, Engine]:
+	fen, moves = position
+	if _worker_state['position'] != (fen, tuple(moves)):
+		chess_instance = chess_.from_position(fen, moves)
+		_worker_state.update(position=(fen, tuple(moves)), chess=chess_instance,
+							 engine=Engine(chess_instance, tt=_worker_state['tt']))
+	return _worker_state['chess'], _worker_state['engine']
+
+
+def _search_root_move(position: Position, root_move: str, depth: int, alpha: int, beta: int,
+					  deadline: Optional[float], generation: int):
+	# Searches the position after the root move within the window (alpha, beta) of the root player, returns the score
+	# (a bound if not within the window), whether the search completed, nodes searched and the principal variation
+	# after the root move. deadline -- wall clock time (`time.time`) by when the search must stop, tasks may wait
+	# in the queue, generation -- of the search (Refer `TranspositionTable.new_search`)
+	movetime = deadline - time.time() if deadline else None
+	if movetime is not None and movetime <= 0:
+		return root_move, alpha, False, 0, []
+	chess_instance, engine = _worker_engine(position)
+	engine.tt.new_search(generation)
+	chess_instance.push(Move.from_uci(root_move, chess_instance))
+	try:
+		result = engine.search_depth(depth - 1, -beta, -alpha, movetime, ply=1)
+	finally:
+		chess_instance.pop()
+	return root_move, -result.score, not engine.interrupted, result.nodes, [move.uci for move in result.pv]
+
+
+class ParallelEngine:
+	# Searches the root moves in parallel across worker processes, deepening one ply at a time.
+	def __init__(self, workers: int = None, hash_mb: float = 16):
+		# workers -- number of processes (default number of cpus), hash_mb -- transposition table size (shared)
+		self.workers = workers or os.cpu_count()
+		self.tt = TranspositionTable.shared(hash_mb)
+		self._generation_ = 0
+		self._executor_ = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.tt.name, hash_mb))
+
+	def search(self, chess: Chess, depth: int = None, movetime: float = None,
+			   info: Callable[[SearchResult], None] = None) -> SearchResult:
+		# Searches the position of the chess object, refer `Engine.search` for the arguments and result.
+		start = time.perf_counter()
+		deadline = time.time() + movetime if movetime else None
+		position = chess.position()
+		root_moves = {move.uci: move for move in chess.legal_moves()}
+		if not root_moves:  # checkmate or stalemate
+			return SearchResult(None, -MATE_SCORE if chess.is_check() else 0, 0, 0, 0.0, [])
+		self._generation_ = (self._generation_ + 1) & 0x3F
+
+		order, nodes = list(root_moves), 0
+		result = SearchResult(root_moves[order[0]], 0, 0, 0, 0.0, [root_moves[order[0]]])
+		for current_depth in range(1, min(depth or MAX_PLY, MAX_PLY) + 1):
+			if deadline and time.time() >= deadline:
+				break
+			best, score, pv, scores, searched, completed = self._search_root_(position, order, current_depth, deadline)
+			nodes += searched
+			if not completed:  # ran out of time, use the previous (completed) depth
+				break
+			# search the best moves first next depth (the scores of the others are bounds)
+			order = [best] + sorted((notation for notation in order if notation != best), key=scores.get, reverse=True)
+			result = SearchResult(root_moves[best], score, current_depth, nodes, time.perf_counter() - start,
+								  self._principal_variation_(chess, [best] + pv))
+			if info:
+				info(result)
+			if abs(score) >= MATE_SCORE - MAX_PLY or len(order) == 1:
+				break
+		return result._replace(nodes=nodes, elapsed=time.perf_counter() - start)
+
+	def _search_root_(self, position: Position, order: List[str], depth: int, deadline: Optional[float]) \
+			-> Tuple[str, int, List[str], Dict[str, int], int, bool]:
+		# Searches the root moves (in order) to the depth. Returns the best move, its score and principal variation
+		# (after the move), scores of the moves (bounds for all but the best), nodes and whether all searches completed.
+		def submit(notation: str, alpha: int, beta: int):
+			future = self._executor_.submit(_search_root_move, position, notation, depth, alpha, beta, deadline,
+											self._generation_)
+			pending[future] = alpha, beta
+			return future
+
+		pending = {}
+		best, score, completed, nodes, pv = submit(order[0], -INFINITY, INFINITY).result()
+		pending.clear()
+		scores = {best: score}
+		for notation in order[1:] if completed else []:  # young brothers wait for the eldest
+			submit(notation, score, score + 1)
+		while pending:
+			done, _ = wait(pending, return_when=FIRST_COMPLETED)
+			for future in done:
+				alpha, beta = pending.pop(future)
+				notation, move_score, move_completed, searched, line = future.result()
+				nodes, completed = nodes + searched, completed and move_completed
+				if not completed:  # the depth is abandoned, the remaining tasks return as the deadline passed
+					continue
+				scores[notation] = move_score
+				if move_score <= alpha:  # at most alpha, not better than the best
+					continue
+				if beta < INFINITY:  # at least beta, search again for its score (if still better than the best)
+					submit(notation, score, INFINITY)
+				elif move_score > score:  # exact score, better than the best so far
+					best, score, pv = notation, move_score, line
+		return best, score, pv, scores, nodes, completed
+
+	@staticmethod
+	def _principal_variation_(chess: Chess, notations: List[str]) -> List[Move]:
+		# Converts the principal variation (long algebraic notation) to moves of the chess object.
+		moves = []
+		try:
+			for notation in notations:
+				move = Move.from_uci(notation, chess)
+				chess.push(move)
+				moves.append(move)
+		finally:
+			for _ in moves:
+				chess.pop()
+		return moves
+
+	def close(self):
+		self._executor_.shutdown()
+		self.tt.close(unlink=True)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import time
+from collections import namedtuple, defaultdict
+from typing import TYPE_CHECKING, List, Callable, Optional
+
+from pieces import Queen
+from .evaluate import evaluate, PIECE_VALUES
+from .transposition import TranspositionTable, encode_move, EXACT, LOWER_BOUND, UPPER_BOUND
+
+if TYPE_CHECKING:
+	from chess import Chess
+	from utils import Move
+
+MAX_PLY = 64
+MATE_SCORE = 100000  # score of checkmate at the root, reduced by ply (prefer faster mates)
+INFINITY = 10 * MATE_SCORE
+TIME_CHECK_NODES = 256  # nodes between checking the time limit
+
+# Move ordering scores
+PV_MOVE_ORDER = 1 << 30
+CAPTURE_ORDER = 1 << 28
+PROMOTION_ORDER = 1 << 27
+KILLER_ORDER = (1 << 26, 1 << 25)
+
+
+class SearchResult(namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes', 'elapsed', 'pv'])):
+	__slots__ = ()
+
+	@property
+	def nps(self) -> int:  # nodes searched per second
+		return int(self.nodes / self.elapsed) if self.elapsed else 0
+
+	@property
+	def mate_in(self) -> Optional[int]:
+		# moves to checkmate (negative if being mated), None if no checkmate found
+		if abs(self.score) < MATE_SCORE - MAX_PLY:
+			return None
+		plies = MATE_SCORE - abs(self.score)
+		return (plies + 1) // 2 if self.score > 0 else -(plies // 2)
+
+
+class SearchStopped(Exception):
+	# Raised inside the search when the time or node limit is reached.
+	pass
+
+
+def move_key(move: Move):
+	# Identifies a move across positions (for killer and history heuristics)
+	return move.old_square, move.new_square, type(move.new_piece)
+
+
+def is_tactical(move: Move) -> bool:
+	return bool(move.captured_piece or move.en_passant_pawn or move.pawn_promoted)
+
+
+def score_to_tt(score: int, ply: int) -> int:
+	# mate scores are stored relative to the position (not the root)
+	if score >= MATE_SCORE - MAX_PLY:
+		return score + ply
+	if score <= -MATE_SCORE + MAX_PLY:
+		return score - ply
+	return score
+
+
+def score_from_tt(score: int, ply: int) -> int:
+	if score >= MATE_SCORE - MAX_PLY:
+		return score - ply
+	if score <= -MATE_SCORE + MAX_PLY:
+		return score + ply
+	return score
+
+
+class Engine:
+	# Negamax alpha-beta search with iterative deepening and quiescence search.
+	# NOTE: The search applies (and reverts) moves on the chess object, like any move it discards redo history.
+	def __init__(self, chess: Chess, hash_mb: float = 16, tt: TranspositionTable = None):
+		# hash_mb -- memory budget (in MB) for the transposition table, tt -- table to use instead (like a shared one)
+		self._chess = chess
+		self.tt = tt if tt is not None else TranspositionTable(hash_mb)
+		self._killers_ = [[None, None] for _ in range(MAX_PLY + 1)]  # quiet moves causing cut-offs, per ply
+		self._history_ = defaultdict(int)  # quiet moves causing cut-offs, weighted by depth
+		self._pv_keys_ = []  # principal variation of the previous iteration (move keys)
+		self._deadline_: float = None
+		self._node_limit_: int = None
+		self._stopped_ = False
+		self.interrupted = False  # whether the last search was stopped (time, nodes or `stop`) before its depth
+		self.nodes = 0
+
+	def search(self, depth: int = None, movetime: float = None, nodes: int = None,
+			   info: Callable[[SearchResult], None] = None) -> SearchResult:
+		# Searches the current position deepening one ply at a time, until the limits are reached.
+		# depth -- maximum depth (plies), movetime -- time limit (in seconds), nodes -- limit on nodes searched
+		# info -- called with the result of each completed depth
+		# Returns the result of the deepest completed depth (best move, score, principal variation...)
+		start = time.perf_counter()
+		self._deadline_ = start + movetime if movetime else None
+		self._node_limit_ = nodes
+		self._stopped_ = False
+		self.interrupted = False
+		self._pv_keys_ = []
+		self.nodes = 0
+		self.tt.new_search()
+		max_depth = min(depth or MAX_PLY, MAX_PLY)
+
+		root_moves = self._chess.legal_moves()
+		if not root_moves:  # checkmate or stalemate
+			return SearchResult(None, -MATE_SCORE if self._chess.is_check() else 0, 0, 0, 0.0, [])
+		result = SearchResult(root_moves[0], 0, 0, 0, 0.0, [root_moves[0]])
+		for current_depth in range(1, max_depth + 1):
+			pv = []
+			try:
+				score = self._negamax_(current_depth, -INFINITY, INFINITY, 0, pv)
+			except SearchStopped:
+				self.interrupted = True
+				break
+			self._pv_keys_ = [move_key(move) for move in pv]
+			result = SearchResult(pv[0], score, current_depth, self.nodes, time.perf_counter() - start, pv)
+			if info:
+				info(result)
+			if abs(score) >= MATE_SCORE - MAX_PLY:  # found a forced checkmate
+				break
+			if len(root_moves) == 1:  # only move, no need to search deeper
+				break
+		return result._replace(nodes=self.nodes, elapsed=time.perf_counter() - start)
+
+	def search_depth(self, depth: int, alpha: int = -INFINITY, beta: int = INFINITY, movetime: float = None,
+					 ply: int = 0) -> SearchResult:
+		# Searches the current position to the depth only (without iterative deepening, the transposition table
+		# orders the moves) within the window, the score is only a bound if not within (alpha, beta).
+		# ply -- of the position from the root, like 1 for the position after a root move (Refer `ParallelEngine`)
+		# `interrupted` is set if the time ran out (or stopped), the result is then not usable.
+		start = time.perf_counter()
+		self._deadline_ = start + movetime if movetime else None
+		self._node_limit_ = None
+		self._stopped_ = False
+		self.interrupted = False
+		self._pv_keys_ = []
+		self.nodes = 0
+		pv, score = [], 0
+		try:
+			score = self._negamax_(depth, alpha, beta, ply, pv)
+		except SearchStopped:
+			self.interrupted = True
+		return SearchResult(pv[0] if pv else None, score, depth, self.nodes, time.perf_counter() - start, pv)
+
+	def stop(self):
+		# Stops the search (from another thread), which returns the result of the deepest completed depth
+		self._stopped_ = True
+
+	def _count_node_(self):
+		self.nodes += 1
+		if self._node_limit_ and self.nodes >= self._node_limit_:
+			raise SearchStopped()
+		if self.nodes % TIME_CHECK_NODES == 0 and \
+				(self._stopped_ or self._deadline_ and time.perf_counter() >= self._deadline_):
+			raise SearchStopped()
+
+	def _negamax_(self, depth: int, alpha: int, beta: int, ply: int, pv: List[Move]) -> int:
+		# Returns the score of the position (for player to move), fills `pv` with the best line if score > alpha
+		if depth <= 0 or ply >= MAX_PLY:
+			return self._quiescence_(alpha, beta, ply)
+		self._count_node_()
+		chess = self._chess
+		# repeating a position (of the line searched or game), fifty moves or insufficient material is a draw
+		if ply > 0 and (chess.repetitions() > 1 or chess.is_fifty_moves() or chess.is_insufficient_material()):
+			return 0
+		key = chess.zobrist_hash
+		entry = self.tt.probe(key)
+		hash_move = 0
+		if entry:
+			hash_move = entry.move
+			if entry.depth >= depth and ply > 0:  # reuse the result of an earlier search (at least as deep)
+				score = score_from_tt(entry.score, ply)
+				if entry.bound == EXACT or (entry.bound == LOWER_BOUND and score >= beta) or \
+						(entry.bound == UPPER_BOUND and score <= alpha):
+					return score
+
+		moves = chess.legal_moves()
+		if not moves:
+			return -MATE_SCORE + ply if chess.is_check() else 0
+
+		original_alpha, best_score, best_move = alpha, -INFINITY, None
+		for move in self._ordered_(moves, ply, hash_move):
+			child_pv = []
+			chess.push(move)
+			try:
+				score = -self._negamax_(depth - 1, -beta, -alpha, ply + 1, child_pv)
+			finally:
+				chess.pop()
+			if score > best_score:
+				best_score, best_move = score, move
+			if score > alpha:
+				alpha = score
+				pv[:] = [move] + child_pv
+				if score >= beta:  # cut-off
+					if not is_tactical(move):
+						self._store_quiet_cutoff_(move, depth, ply)
+					break
+
+		if best_score >= beta:
+			bound = LOWER_BOUND
+		elif best_score > original_alpha:
+			bound = EXACT
+		else:
+			bound = UPPER_BOUND
+		self.tt.store(key, depth, score_to_tt(best_score, ply), bound, encode_move(best_move))
+		return best_score
+
+	def _quiescence_(self, alpha: int, beta: int, ply: int) -> int:
+		# Searches only captures (and promotions to queen) until the position is quiet, to avoid horizon effects.
+		self._count_node_()
+		chess = self._chess
+		stand_pat = evaluate(chess)
+		if stand_pat >= beta or ply >= MAX_PLY:
+			return stand_pat
+		moves = chess.legal_moves()
+		if not moves:
+			return -MATE_SCORE + ply if chess.is_check() else 0
+		alpha = max(alpha, stand_pat)
+		tactical_moves = [move for move in moves if move.captured_piece or move.en_passant_pawn or
+						  (move.pawn_promoted and isinstance(move.new_piece, Queen))]
+		for move in sorted(tactical_moves, key=self._capture_order_, reverse=True):
+			chess.push(move)
+			try:
+				score = -self._quiescence_(-beta, -alpha, ply + 1)
+			finally:
+				chess.pop()
+			if score >= beta:
+				return score
+			alpha = max(alpha, score)
+		return alpha
+
+	@staticmethod
+	def _capture_order_(move: Move) -> int:
+		# Most valuable victim, least valuable attacker (MVV-LVA)
+		victim = move.captured_piece or move.en_passant_pawn
+		order = 10 * PIECE_VALUES[type(victim)] - PIECE_VALUES[type(move.piece)] if victim else 0
+		if move.pawn_promoted:
+			order += PIECE_VALUES[type(move.new_piece)]
+		return order
+
+	def _ordered_(self, moves: List[Move], ply: int, hash_move: int = 0) -> List[Move]:
+		# Orders moves, previous principal variation (or best move from transposition table) first,
+		# then captures (MVV-LVA) and promotions, killer moves and the remaining quiet moves by history heuristic.
+		pv_key = self._pv_keys_[ply] if ply < len(self._pv_keys_) else None
+		killers, history = self._killers_[ply], self._history_
+
+		def order(move: Move) -> int:
+			key = move_key(move)
+			if key == pv_key:
+				return PV_MOVE_ORDER
+			if hash_move and encode_move(move) == hash_move:
+				return PV_MOVE_ORDER - 1
+			if move.captured_piece or move.en_passant_pawn:
+				return CAPTURE_ORDER + self._capture_order_(move)
+			if move.pawn_promoted:
+				return PROMOTION_ORDER + PIECE_VALUES[type(move.new_piece)]
+			if key == killers[0]:
+				return KILLER_ORDER[0]
+			if key == killers[1]:
+				return KILLER_ORDER[1]
+			return history[(move.player, key)]
+
+		return sorted(moves, key=order, reverse=True)
+
+	def _store_quiet_cutoff_(self, move: Move, depth: int, ply: int):
+		key = move_key(move)
+		killers = self._killers_[ply]
+		if killers[0] != key:
+			killers[1], killers[0] = killers[0], key
+		self._history_[(move.player, key)] += depth * depth
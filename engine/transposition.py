@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from array import array
+from collections import namedtuple
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+	from utils import Move
+
+"""
+Transposition table, stores search results of positions (by zobrist hash) to reuse when the position is reached again.
+Entries live in two preallocated arrays (keys and packed data), sized from a memory budget, so memory stays flat.
+Each bucket has two entries, the first is replaced only by a search of the same or greater depth
+(or if stored by an earlier search), the second is always replaced.
+The arrays can be in shared memory, so that processes searching in parallel share the table (Refer `shared`).
+Keys are stored XOR-ed with the data, an entry torn by writes from two processes does not match its key (is a miss).
+
+Packed data (64 bits): move (16) | depth (8) | bound (2) | generation (6) | score + 2^31 (32)
+Packed move (16 bits) Refer `Move.code`
+"""
+
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2  # score is exact, at least (failed high) or at most (failed low)
+
+ENTRY_SIZE = 16  # bytes, key and packed data
+
+TTEntry = namedtuple('TTEntry', ['depth', 'score', 'bound', 'move'])
+TTInfo = namedtuple('TTInfo', ['probes', 'hits', 'stores', 'entries', 'size_mb'])
+
+
+def encode_move(move: Move) -> int:
+	# Packs the squares (and promotion) of the move into 16 bits, never zero for a move.
+	return move.code
+
+
+class TranspositionTable:
+	def __init__(self, size_mb: float = 16, memory: shared_memory.SharedMemory = None):
+		# memory -- shared memory to keep the entries in (Refer `shared`), otherwise private arrays
+		self._entries_ = max(2, int(size_mb * 1024 * 1024) // ENTRY_SIZE // 2 * 2)
+		self._buckets_ = self._entries_ // 2
+		self._memory_ = memory
+		if memory:
+			words = memory.buf.cast('Q')
+			self._keys_, self._data_ = words[:self._entries_], words[self._entries_:2 * self._entries_]
+		else:
+			self._keys_ = array('Q', [0]) * self._entries_
+			self._data_ = array('Q', [0]) * self._entries_  # zero for empty entries
+		self._generation_ = 0
+		self.probes = 0
+		self.hits = 0
+		self.stores = 0
+
+	@classmethod
+	def shared(cls, size_mb: float = 16, name: str = None) -> TranspositionTable:
+		# Table in shared memory, created (empty) if name is None otherwise attached to (Refer `name`).
+		# Creator must `unlink` the memory once every process has closed it.
+		entries = max(2, int(size_mb * 1024 * 1024) // ENTRY_SIZE // 2 * 2)
+		memory = shared_memory.SharedMemory(name, create=name is None, size=entries * ENTRY_SIZE)
+		return cls(size_mb, memory)
+
+	@property
+	def name(self) -> Optional[str]:
+		# name of the shared memory (to attach other processes), None if not shared
+		return self._memory_.name if self._memory_ else None
+
+	def close(self, unlink: bool = False):
+		# Releases the shared memory (if shared), unlink -- also removes it (by the creator)
+		if self._memory_:
+			self._keys_.release()
+			self._data_.release()
+			self._memory_.close()
+			if unlink:
+				self._memory_.unlink()
+			self._memory_ = None
+
+	def new_search(self, generation: int = None):
+		# Called at the start of every search, entries from earlier searches are replaced first.
+		# generation -- of the search, when processes sharing the table search parts of the same search
+		self._generation_ = (self._generation_ + 1 if generation is None else generation) & 0x3F
+
+	def probe(self, key: int) -> Optional[TTEntry]:
+		self.probes += 1
+		index = (key % self._buckets_) * 2
+		for slot in (index, index + 1):
+			data = self._data_[slot]
+			if data and self._keys_[slot] ^ data == key:
+				self.hits += 1
+				return TTEntry(data >> 16 & 0xFF, (data >> 32) - (1 << 31), data >> 24 & 0x3, data & 0xFFFF)
+		return None
+
+	def store(self, key: int, depth: int, score: int, bound: int, move: int):
+		# move -- packed move (Refer `encode_move`), or 0 if no best move
+		self.stores += 1
+		index = (key % self._buckets_) * 2
+		data = move | min(depth, 0xFF) << 16 | bound << 24 | self._generation_ << 26 | (score + (1 << 31)) << 32
+		stored = self._data_[index]
+		if not stored or self._keys_[index] ^ stored == key or depth >= (stored >> 16 & 0xFF) or \
+				(stored >> 26 & 0x3F) != self._generation_:
+			slot = index  # depth-preferred entry
+		else:
+			slot = index + 1  # always-replace entry
+		self._keys_[slot] = key ^ data
+		self._data_[slot] = data
+
+	def clear(self):
+		empty = array('Q', [0]) * self._entries_
+		self._keys_[:] = empty  # in place, the arrays may be shared
+		self._data_[:] = empty
+
+	@property
+	def hit_rate(self) -> float:
+		return self.hits / self.probes if self.probes else 0.0
+
+	@property
+	def hashfull(self) -> int:
+		# entries used (per thousand) by the current search, sampled from the first 1000 entries.
+		sample = min(1000, self._entries_)
+		used = sum(1 for slot in range(sample) if self._data_[slot] and
+				   (self._data_[slot] >> 26 & 0x3F) == self._generation_)
+		return used * 1000 // sample
+
+	def info(self) -> TTInfo:
+		return TTInfo(self.probes, self.hits, self.stores, self._entries_, self._entries_ * ENTRY_SIZE / (1 << 20))
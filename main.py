@@ -4,6 +4,10 @@ import chess
 import constants
 import pieces
 
+# Events after which the window must be redrawn, window events (`WINDOWEXPOSED`) are only in pygame 2.0.1 and later
+EXPOSE_EVENTS = tuple(event for event in (pygame.VIDEOEXPOSE, getattr(pygame, 'WINDOWEXPOSED', None))
+					  if event is not None)
+
 
 def game():
 	pygame.init()
@@ -14,22 +18,29 @@ def game():
 
 	pieces.load_images()
 	chess_instance = chess.from_initial()
+	renderer = chess.Renderer(win, small_font)
+	# Only events which change what is shown wake the loop, it sleeps (in `event.wait`) otherwise.
+	pygame.event.set_blocked(None)
+	pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, *EXPOSE_EVENTS])
 	run = True
 	while run:
-		chess_instance.draw(win, small_font)
-		chess_instance.draw_status(win, small_font)
-		pygame.display.update()
-		for event in pygame.event.get():
+		dirty_rects = renderer.render(chess_instance)  # redraws only what changed
+		if dirty_rects:
+			pygame.display.update(dirty_rects)
+		for event in [pygame.event.wait()] + pygame.event.get():
 			if event.type == pygame.QUIT or \
 					(event.type == pygame.KEYDOWN and event.key == pygame.K_q):
 				run = False
 
+			if event.type in EXPOSE_EVENTS:
+				renderer.invalidate()
+
 			if event.type == pygame.KEYDOWN:
 				chess_instance.handle_keypress(key=event.key)
 
 			if event.type == pygame.MOUSEBUTTONDOWN:
 				chess_instance.handle_click(pos=event.pos)
-		clock.tick(constants.FPS)
+		clock.tick(constants.FPS)  # at most FPS renders per second
 	pygame.quit()
 
 
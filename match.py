@@ -0,0 +1,231 @@
+import argparse
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import chess
+from engine import Engine, evaluate
+from utils import Move, Player, PGNGame, read_pgn, write_pgn
+
+"""
+Plays matches between two players (from a set of openings) across processes, writes the games as PGN
+and reports the score, the Elo difference (with 95% error bars) and the games per hour.
+Each opening is played twice, the players swapping colors.
+Players are `random`, `greedy` (best evaluation after the move) or `search` with limits, like `search:depth=3`,
+`search:movetime=0.1` or `search:nodes=20000,depth=6`.
+python match.py search:depth=2 greedy --games 100 --workers 4 --pgn match.pgn
+"""
+
+# Openings (SAN) played from the initial position, unless read from a PGN archive (Refer `--openings`)
+OPENINGS = [
+	'e4 e5 Nf3 Nc6 Bb5 a6',  # Ruy Lopez
+	'e4 e5 Nf3 Nc6 Bc4 Bc5',  # Italian Game
+	'e4 c5 Nf3 d6 d4 cxd4',  # Sicilian Defence
+	'e4 e6 d4 d5',  # French Defence
+	'e4 c6 d4 d5',  # Caro-Kann Defence
+	'd4 d5 c4 e6',  # Queen's Gambit Declined
+	'd4 Nf6 c4 g6 Nc3 Bg7',  # King's Indian Defence
+	'd4 Nf6 c4 e6 Nc3 Bb4',  # Nimzo-Indian Defence
+	'c4 e5 Nc3 Nf6',  # English Opening
+	'Nf3 d5 g3 Nf6',  # Reti Opening
+]
+SEARCH_LIMITS = {'depth': int, 'movetime': float, 'nodes': int}
+NORMAL_TERMINATIONS = ('checkmate', 'stalemate', 'insufficient material')  # others are adjudicated (or claimed)
+RESULT_SCORES = {'1-0': (1.0, 0.0), '0-1': (0.0, 1.0), '1/2-1/2': (0.5, 0.5)}  # (white, black)
+
+
+class RandomPlayer:
+	def __init__(self, chess_instance: chess.Chess, rng: random.Random):
+		self._chess = chess_instance
+		self._rng = rng
+
+	def choose(self) -> Move:
+		return self._rng.choice(self._chess.legal_moves())
+
+
+class GreedyPlayer(RandomPlayer):
+	# Makes the move with the best (static) evaluation, choosing randomly among equally good moves
+	def choose(self) -> Move:
+		chess_instance, scores = self._chess, []
+		for move in chess_instance.legal_moves():
+			chess_instance.push(move)
+			scores.append((-evaluate(chess_instance), move))
+			chess_instance.pop()
+		best = max(score for score, _ in scores)
+		return self._rng.choice([move for score, move in scores if score == best])
+
+
+class SearchPlayer:
+	def __init__(self, chess_instance: chess.Chess, rng: random.Random, depth: int = None, movetime: float = None,
+				 nodes: int = None):
+		self._engine = Engine(chess_instance)
+		self._limits = depth, movetime, nodes
+
+	def choose(self) -> Move:
+		return self._engine.search(*self._limits).move
+
+
+PLAYERS = {'random': RandomPlayer, 'greedy': GreedyPlayer, 'search': SearchPlayer}
+
+
+def parse_player(spec: str) -> Tuple[str, Dict]:
+	# Returns the kind of player and the limits (only of `search`), raises ValueError if the spec is invalid
+	kind, _, options = spec.partition(':')
+	if kind not in PLAYERS or (options and kind != 'search'):
+		raise ValueError(f'Unknown player {spec}.')
+	limits = {}
+	for option in filter(None, options.split(',')):
+		name, _, value = option.partition('=')
+		if name not in SEARCH_LIMITS:
+			raise ValueError(f'Unknown limit {name} of player {spec}.')
+		limits[name] = SEARCH_LIMITS[name](value)
+	if kind == 'search' and not limits:
+		limits['depth'] = 2
+	return kind, limits
+
+
+def adjudicate(chess_instance: chess.Chess) -> Optional[Tuple[str, str]]:
+	# Returns the result and the reason if the game is over (draws which can be claimed are claimed)
+	status = chess_instance.status()
+	if status.checkmate:
+		return ('1-0' if chess_instance.turn == Player.BLACK else '0-1'), 'checkmate'
+	if status.stalemate:
+		return '1/2-1/2', 'stalemate'
+	if chess_instance.is_insufficient_material():
+		return '1/2-1/2', 'insufficient material'
+	if chess_instance.is_threefold_repetition():
+		return '1/2-1/2', 'repetition'
+	if chess_instance.is_fifty_moves():
+		return '1/2-1/2', 'fifty moves'
+	return None
+
+
+def play_game(index: int, opening: List[str], white: str, black: str, max_plies: int, seed: int) -> Tuple:
+	# Plays a game (in a worker process), returns the game, the reason it ended and the time taken
+	start, rng = time.perf_counter(), random.Random(seed * 1000003 + index)
+	chess_instance = chess.from_initial()
+	notations = []
+	for notation in opening:
+		move = Move.from_notation(notation, chess_instance, strict=True)
+		chess_instance.make_move(move)
+		notations.append(move.notation)
+	players = {}
+	for player, spec in ((Player.WHITE, white), (Player.BLACK, black)):
+		kind, limits = parse_player(spec)
+		players[player] = PLAYERS[kind](chess_instance, rng, **limits)
+
+	outcome = adjudicate(chess_instance)
+	while outcome is None and len(notations) < max_plies:
+		move = players[chess_instance.turn].choose()
+		chess_instance.make_move(move)
+		notations.append(move.notation)
+		outcome = adjudicate(chess_instance)
+	result, reason = outcome or ('1/2-1/2', 'maximum plies')
+
+	headers = {'Event': 'pychess match', 'Site': '?', 'Date': date.today().strftime('%Y.%m.%d'),
+			   'Round': str(index + 1), 'White': white, 'Black': black, 'Result': result,
+			   'PlyCount': str(len(notations)), 'Termination': 'normal' if reason in NORMAL_TERMINATIONS else 'adjudication'}
+	return PGNGame(headers, notations, result), reason, time.perf_counter() - start
+
+
+def read_openings(file: str, plies: int) -> List[List[str]]:
+	# First plies of the games of the PGN archive (distinct), games set up from a position (`FEN` tag pair)
+	# are skipped, as the openings are played from the initial position.
+	openings = {tuple(game.moves[:plies]) for game in read_pgn(file)
+				if len(game.moves) >= plies and 'FEN' not in game.headers}
+	return [list(opening) for opening in sorted(openings)]
+
+
+def elo_difference(wins: int, draws: int, losses: int) -> Tuple[float, float]:
+	# Elo difference (of the player scoring wins) and the 95% error margin, from the score and its standard error.
+	# Both are infinite if all games are won (or lost) and not a number (nan) if no games were played.
+	games = wins + draws + losses
+	if not games:
+		return math.nan, math.nan
+	score = (wins + 0.5 * draws) / games
+	variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+	margin = 1.96 * math.sqrt(variance / games)
+
+	def elo(p):
+		if p <= 0:
+			return -math.inf
+		if p >= 1:
+			return math.inf
+		return 400 * math.log10(p / (1 - p))
+
+	if score in (0, 1):  # all games won (or lost), the difference is not bounded
+		return elo(score), math.inf
+	return elo(score), (elo(score + margin) - elo(score - margin)) / 2
+
+
+def run_match(player1: str, player2: str, games: int, openings: List[List[str]], workers: int = None,
+			  max_plies: int = 300, seed: int = 0, pgn_file: str = None) -> Counter:
+	# Plays the games across processes, writes them (as they end) to the PGN file, prints the summary
+	tasks = []
+	for index in range(games):
+		white, black = (player1, player2) if index % 2 == 0 else (player2, player1)
+		tasks.append((index, openings[index // 2 % len(openings)], white, black, max_plies, seed))
+	counts, reasons, start = Counter(), Counter(), time.perf_counter()
+
+	def tally(results) -> Iterator[PGNGame]:
+		for (index, *_), (game, reason, _) in zip(tasks, results):  # results are in the order of the tasks
+			white_score, black_score = RESULT_SCORES[game.result]
+			score = white_score if index % 2 == 0 else black_score  # player1 is white in even games
+			counts['wins' if score == 1 else 'losses' if score == 0 else 'draws'] += 1
+			counts['plies'] += len(game.moves)
+			reasons[reason] += 1
+			yield game
+
+	with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+		results = tally(executor.map(play_game, *zip(*tasks)))
+		if pgn_file:
+			write_pgn(results, pgn_file)
+		else:
+			for _ in results:
+				pass
+
+	elapsed = time.perf_counter() - start
+	wins, draws, losses = counts['wins'], counts['draws'], counts['losses']
+	elo, margin = elo_difference(wins, draws, losses)
+	score = f'{(wins + 0.5 * draws) / games:.1%}' if games else 'n/a'
+	difference = f'{elo:+.0f} +/- {margin:.0f}' if not math.isnan(elo) else 'n/a'
+	rate = f'{games / elapsed * 3600:.0f}' if elapsed > 0 else 'n/a'
+	print(f'{player1} vs {player2}: +{wins} ={draws} -{losses} score {score}, elo difference {difference}')
+	print(f'{games} games, {counts["plies"]} plies in {elapsed:.1f}s ({rate} games/hour), '
+		  f'ended by {", ".join(f"{reason} {count}" for reason, count in reasons.most_common()) or "-"}')
+	return counts
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('player1', help='random, greedy or search (with limits, like `search:depth=3`)')
+	parser.add_argument('player2', help='random, greedy or search (with limits, like `search:movetime=0.1`)')
+	parser.add_argument('--games', default=20, type=int, help='number of games. default `20`')
+	parser.add_argument('--workers', default=None, type=int, help='number of processes. default number of cpus')
+	parser.add_argument('--openings', default=None, help='PGN archive to take the openings from. default built-in')
+	parser.add_argument('--opening-plies', default=8, type=int,
+						help='plies of the games (of the archive) played as the opening. default `8`')
+	parser.add_argument('--max-plies', default=300, type=int,
+						help='plies after which the game is adjudicated a draw. default `300`')
+	parser.add_argument('--seed', default=0, type=int, help='seed for the random choices. default `0`')
+	parser.add_argument('--pgn', default=None, help='file to write the games to (PGN)')
+	args = parser.parse_args()
+
+	try:
+		parse_player(args.player1), parse_player(args.player2)
+	except ValueError as e:
+		print(e)
+		exit(1)
+	if args.openings:
+		openings = read_openings(args.openings, args.opening_plies)
+	else:
+		openings = [opening.split() for opening in OPENINGS]
+	if not openings:
+		print('No openings.')
+		exit(1)
+	run_match(args.player1, args.player2, args.games, openings, args.workers, args.max_plies, args.seed, args.pgn)
@@ -0,0 +1,103 @@
+import argparse
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import chess
+from chess import Chess
+
+"""
+Perft (performance test) walks the tree of legal moves to a fixed depth and counts the leaf nodes.
+The counts are compared against published values to verify the move generator,
+and the time taken measures the move generator's speed.
+
+Run the regression suite using
+python perft.py --suite --depth 3
+"""
+
+# Standard perft positions with their published node counts (depth -> nodes).
+# Refer https://www.chessprogramming.org/Perft_Results
+PERFT_SUITE: List[Tuple[str, str, Dict[int, int]]] = [
+	('initial', chess.INITIAL_FEN,
+	 {1: 20, 2: 400, 3: 8902, 4: 197281, 5: 4865609}),
+	('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+	 {1: 48, 2: 2039, 3: 97862, 4: 4085603}),
+	('position 3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+	 {1: 14, 2: 191, 3: 2812, 4: 43238, 5: 674624}),
+	('position 4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+	 {1: 6, 2: 264, 3: 9467, 4: 422333}),
+	('position 5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+	 {1: 44, 2: 1486, 3: 62379, 4: 2103487}),
+	('position 6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+	 {1: 46, 2: 2079, 3: 89890, 4: 3894594}),
+]
+
+
+def perft(chess_instance: Chess, depth: int) -> int:
+	# Returns the number of leaf nodes of the legal move tree of given depth from the current position.
+	moves = chess_instance.legal_moves()
+	if depth <= 1:
+		return len(moves) if depth == 1 else 1
+	nodes = 0
+	for move in moves:
+		chess_instance.push(move)
+		nodes += perft(chess_instance, depth - 1)
+		chess_instance.pop()
+	return nodes
+
+
+def divide(chess_instance: Chess, depth: int) -> Dict[str, int]:
+	# Returns the leaf node counts for each move (in long algebraic notation) from the current position.
+	counts = {}
+	for move in chess_instance.legal_moves():
+		chess_instance.push(move)
+		counts[move.uci] = perft(chess_instance, depth - 1)
+		chess_instance.pop()
+	return counts
+
+
+def timed_perft(chess_instance: Chess, depth: int) -> Tuple[int, float]:
+	start = time.perf_counter()
+	nodes = perft(chess_instance, depth)
+	return nodes, time.perf_counter() - start
+
+
+def run_suite(max_depth: int, backend: str) -> bool:
+	# Runs the perft suite up to max_depth, and returns whether all the node counts matched.
+	passed = True
+	for name, fen, expected in PERFT_SUITE:
+		for depth in sorted(expected):
+			if depth > max_depth:
+				break
+			nodes, elapsed = timed_perft(chess.from_fen(fen, backend), depth)
+			status = 'ok' if nodes == expected[depth] else f'FAILED (expected {expected[depth]})'
+			passed = passed and nodes == expected[depth]
+			print(f'{name:>12} depth {depth}: {nodes:>9} nodes {elapsed:8.3f}s '
+				  f'{nodes / elapsed:8.0f} nodes/s {status}')
+	return passed
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--depth', default=3, type=int, help='depth of the move tree. default `3`')
+	parser.add_argument('--fen', default=chess.INITIAL_FEN, help='position to start from. default initial position')
+	parser.add_argument('--divide', default=False, action='store_true', help='print node counts for each move')
+	parser.add_argument('--suite', default=False, action='store_true',
+						help='run the standard perft positions up to `--depth` and check the node counts')
+	parser.add_argument('--backend', default='dict', help='board backend, `dict` or `bitboard`. default `dict`')
+	args = parser.parse_args()
+
+	if args.suite:
+		sys.exit(0 if run_suite(args.depth, args.backend) else 1)
+
+	chess_instance = chess.from_fen(args.fen, args.backend)
+	start = time.perf_counter()
+	if args.divide:
+		counts = divide(chess_instance, args.depth)
+		for notation, count in counts.items():
+			print(f'{notation}: {count}')
+		nodes = sum(counts.values())
+	else:
+		nodes = perft(chess_instance, args.depth)
+	elapsed = time.perf_counter() - start
+	print(f'depth {args.depth}: {nodes} nodes {elapsed:.3f}s {nodes / elapsed:.0f} nodes/s')
@@ -3,12 +3,12 @@ from __future__ import annotations
 from utils import Square, Move
 from .piece import Piece
 from .rook import Rook
+from .tables import KING_SQUARES
 
 
 class King(Piece):
 	def under_check(self):
-		attacked_squares = self.board.attacked_squares(self.player.enemy)
-		return self.square in attacked_squares
+		return self.board.is_attacked(self.square, self.player.enemy)
 
 	def king_side_castle(self):
 		x, y = self.square
@@ -17,7 +17,8 @@ class King(Piece):
 				# no pieces between rook and king and rook must not have moved
 				piece: Piece = self.board[Square(7, y)]
 				if piece.player == self.player and isinstance(piece, Rook) and not piece.moved:
-					if not self.under_check():  # NOTE: No castling under check
+					# NOTE: No castling under check or through an attacked square
+					if not self.under_check() and not self.board.is_attacked(Square(5, y), self.player.enemy):
 						return Move.castle(self.board, king=self, new_king_square=Square(6, y), rook=piece,
 										   new_rook_square=Square(5, y))
 
@@ -29,21 +30,14 @@ class King(Piece):
 				# no pieces between rook and king and rook must not have moved
 				piece: Piece = self.board[Square(0, y)]
 				if piece.player == self.player and isinstance(piece, Rook) and not piece.moved:
-					if not self.under_check():  # NOTE: No castling under check
+					# NOTE: No castling under check or through an attacked square
+					if not self.under_check() and not self.board.is_attacked(Square(3, y), self.player.enemy):
 						return Move.castle(self.board, king=self, new_king_square=Square(2, y), rook=piece,
 										   new_rook_square=Square(3, y))
 
 	def possible_moves(self):
-		x, y = self.square
 		# typical one hop moves
-		moves = list(map(
-			lambda square: Move.typical(self.board, piece=self, new_square=square),
-			filter(
-				# Either no piece or enemy piece to capture
-				lambda square: square and (not self.board[square] or self.board[square].player != self.player),
-				(Square(x + 1, y), Square(x, y + 1), Square(x + 1, y + 1), Square(x - 1, y + 1),
-				 Square(x - 1, y), Square(x, y - 1), Square(x + 1, y - 1), Square(x - 1, y - 1))
-			)))
+		moves = self.board.typical_moves_of(self)
 
 		# castling moves
 		king_side_castle = self.king_side_castle()
@@ -56,15 +50,15 @@ class King(Piece):
 
 		return moves
 
-	def attack_squares(self):
-		x, y = self.square
+	def _attack_squares_(self):
 		# typical one hop moves
-		return list(filter(
-			# Either no piece or enemy piece to capture
-			lambda square: square and (not self.board[square] or self.board[square].player != self.player),
-			(Square(x + 1, y), Square(x, y + 1), Square(x + 1, y + 1), Square(x - 1, y + 1),
-			 Square(x - 1, y), Square(x, y - 1), Square(x + 1, y - 1), Square(x - 1, y - 1))
-		))
+		board, player = self.board, self.player
+		squares = []
+		for square in KING_SQUARES[self.square]:
+			piece = board[square]
+			if piece is None or piece.player != player:  # Either no piece or enemy piece to capture
+				squares.append(square)
+		return squares
 
 
 	@property
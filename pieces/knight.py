@@ -1,20 +1,21 @@
 from __future__ import annotations
 
-from utils import Square, Move
 from .piece import Piece
+from .tables import KNIGHT_SQUARES
 
 
 class Knight(Piece):
 	def possible_moves(self):
-		return list(map(lambda square: Move.typical(self.board, self, square), self.attack_squares()))
+		return self.board.typical_moves_of(self)
 
-	def attack_squares(self):
-		x, y = self.square
-		return list(filter(
-			lambda square: square and (not self.board[square] or self.board[square].player != self.player),
-			[Square(x - 1, y - 2), Square(x + 1, y - 2), Square(x - 2, y - 1), Square(x + 2, y - 1),
-			 Square(x - 1, y + 2), Square(x + 1, y + 2), Square(x - 2, y + 1), Square(x + 2, y + 1)]
-		))
+	def _attack_squares_(self):
+		board, player = self.board, self.player
+		squares = []
+		for square in KNIGHT_SQUARES[self.square]:
+			piece = board[square]
+			if piece is None or piece.player != player:  # Either no piece or enemy piece to capture
+				squares.append(square)
+		return squares
 
 
 	@property
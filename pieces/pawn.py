@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from utils import Player, Square, Move
 from .piece import Piece
+from .tables import PAWN_PUSH_SQUARES, PAWN_ATTACK_SQUARES
 
 
 class Pawn(Piece):
@@ -19,52 +20,43 @@ class Pawn(Piece):
 				return Move.en_passant(self.board, self, en_passant_square, enemy_piece)
 
 	def possible_moves(self):
-		x, y = self.square
-		forward_square = Square(x, y - 1) if self.player == Player.WHITE else Square(x, y + 1)
-		forward_two_square = Square(x, y - 2) if self.player == Player.WHITE else Square(x, y + 2)
-		right_square = Square(x + 1, y - 1) if self.player == Player.WHITE else Square(x + 1, y + 1)
-		left_square = Square(x - 1, y - 1) if self.player == Player.WHITE else Square(x - 1, y + 1)
-
-		moves = []
-		if not self.moved:  # if not yet moved
-			if not self.board[forward_square] and not self.board[forward_two_square]:
-				# if nothing in first two squares, can move two squares
-				moves.append(Move.typical(self.board, piece=self, new_square=forward_two_square))
-
-		# promotion occurs if pawn reaches last rank
-		promotion = (y - 1) == 0 if self.player == Player.WHITE else (y + 1) == 7
-		if promotion:
-			# note: promoted piece is determined by the player.
-			if forward_square and not self.board[forward_square]:  # if nothing forward, can move one square forward
-				moves.append(Move.pawn_promotion(self.board, self, forward_square, new_piece=None))
-			if right_square and self.board[right_square] and self.board[right_square].player != self.player:
-				moves.append(Move.pawn_promotion(self.board, self, right_square, new_piece=None))
-			if left_square and self.board[left_square] and self.board[left_square].player != self.player:
-				moves.append(Move.pawn_promotion(self.board, self, left_square, new_piece=None))
-
-		else:  # if no promotion possible (typical)
-			if forward_square and not self.board[forward_square]:  # if nothing forward, can move one square forward
-				moves.append(Move.typical(self.board, self, forward_square))
-			if right_square and self.board[right_square] and self.board[right_square].player != self.player:
-				moves.append(Move.typical(self.board, self, right_square))
-			if left_square and self.board[left_square] and self.board[left_square].player != self.player:
-				moves.append(Move.typical(self.board, self, left_square))
-
+		moves = self.board.pawn_moves_of(self)
 		en_passant = self.en_passant()
 		if en_passant:
 			moves.append(en_passant)
 
 		return moves
 
-	def attack_squares(self):
-		x, y = self.square
-		right_square = Square(x + 1, y - 1) if self.player == Player.WHITE else Square(x + 1, y + 1)
-		left_square = Square(x - 1, y - 1) if self.player == Player.WHITE else Square(x - 1, y + 1)
-		return list(filter(
-			# Either no piece or enemy piece to capture
-			lambda square: square and (not self.board[square] or self.board[square].player != self.player),
-			[left_square, right_square]
-		))
+	def _pawn_moves_(self):
+		# Returns the moves forward and the captures (Refer `Board.pawn_moves_of`)
+		board, player, square = self.board, self.player, self.square
+		new_squares = []
+		# one square forward, or if on initial rank (not yet moved) and nothing in first two squares, two squares
+		for new_square in PAWN_PUSH_SQUARES[player][square]:
+			if board[new_square] is not None:
+				break
+			new_squares.append(new_square)
+		for new_square in PAWN_ATTACK_SQUARES[player][square]:  # captures enemy piece diagonally forward
+			piece = board[new_square]
+			if piece is not None and piece.player != player:
+				new_squares.append(new_square)
+
+		# promotion occurs if pawn reaches last rank
+		promotion = square.y == (1 if player == Player.WHITE else 6)
+		if promotion:
+			# note: promoted piece is determined by the player.
+			return [Move.pawn_promotion(board, self, new_square, new_piece=None) for new_square in new_squares]
+		# if no promotion possible (typical)
+		return [Move.typical(board, self, new_square) for new_square in new_squares]
+
+	def _attack_squares_(self):
+		board, player = self.board, self.player
+		squares = []
+		for square in PAWN_ATTACK_SQUARES[player][self.square]:
+			piece = board[square]
+			if piece is None or piece.player != player:  # Either no piece or enemy piece to capture
+				squares.append(square)
+		return squares
 
 
 	@property
@@ -34,11 +34,30 @@ class Piece:
 
 	def possible_moves(self) -> List[Move]:
 		# Returns ALL possible moves the piece can take! (without considering consequences like check)
-		raise NotImplemented
+		raise NotImplementedError
 
 	def attack_squares(self):
 		# Returns ALL squares where piece can capture (except en-passant).
-		raise NotImplemented
+		return self.board.attack_squares_of(self)
+
+	def _attack_squares_(self) -> List[Square]:
+		# Same as `attack_squares`, by probing the squares of the tables (Refer `Board.attack_squares_of`)
+		raise NotImplementedError
+
+	def _ray_squares_(self, rays) -> List[Square]:
+		# Returns the squares along the rays (Refer `pieces.tables`) up to and including the first enemy piece.
+		board, player = self.board, self.player
+		squares = []
+		for ray in rays:
+			for square in ray:
+				piece = board[square]
+				if piece is None:  # if nothing in pathway
+					squares.append(square)
+					continue
+				if piece.player != player:  # if enemy in pathway
+					squares.append(square)
+				break
+		return squares
 
 	def __str__(self):
 		return f'{self.player} {self.__class__.__name__} {self.square}'
@@ -46,16 +65,13 @@ class Piece:
 	def __repr__(self):
 		return f'{self.__class__.__name__}({self.player}, <board>)'
 
-	def __hash__(self):
-		return hash(id(self))
-
 	# Necessary to set the images for the pieces (king, queen, ...) for drawing.
 	IMG = {Player.WHITE: None, Player.BLACK: None}
 
 
 	@property
 	def notation(self) -> str:
-		raise NotImplemented
+		raise NotImplementedError
 
 	@classmethod
 	def set_image(cls, white_img: Surface, black_img: Surface):
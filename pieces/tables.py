@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from utils import Player, Square
+
+"""
+Precomputed (at import) geometry of the pieces for every square of the board.
+Pieces use these tables instead of building the candidate squares on each call.
+Rays are ordered outwards from the square, so the first occupied square along a ray is the blocker.
+"""
+
+Ray = Tuple[Square, ...]
+
+ALL_SQUARES = tuple(Square(index % 8, index // 8) for index in range(64))
+
+KNIGHT_OFFSETS = ((-1, -2), (1, -2), (-2, -1), (2, -1), (-1, 2), (1, 2), (-2, 1), (2, 1))
+KING_OFFSETS = ((1, 0), (0, 1), (1, 1), (-1, 1), (-1, 0), (0, -1), (1, -1), (-1, -1))
+BISHOP_DIRECTIONS = ((-1, -1), (1, 1), (1, -1), (-1, 1))
+ROOK_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+QUEEN_DIRECTIONS = BISHOP_DIRECTIONS + ROOK_DIRECTIONS
+PAWN_DIRECTION = {Player.WHITE: -1, Player.BLACK: 1}  # change in y when pawn moves forward
+
+
+def _offset_squares(square: Square, offsets) -> Tuple[Square, ...]:
+	return tuple(Square(square.x + dx, square.y + dy) for dx, dy in offsets
+				 if 0 <= square.x + dx < 8 and 0 <= square.y + dy < 8)
+
+
+def _ray(square: Square, direction: Tuple[int, int]) -> Ray:
+	(dx, dy), squares = direction, []
+	x, y = square.x + dx, square.y + dy
+	while 0 <= x < 8 and 0 <= y < 8:
+		squares.append(Square(x, y))
+		x, y = x + dx, y + dy
+	return tuple(squares)
+
+
+KNIGHT_SQUARES: Dict[Square, Tuple[Square, ...]] = {sq: _offset_squares(sq, KNIGHT_OFFSETS) for sq in ALL_SQUARES}
+KING_SQUARES: Dict[Square, Tuple[Square, ...]] = {sq: _offset_squares(sq, KING_OFFSETS) for sq in ALL_SQUARES}
+
+# Squares attacked by a pawn of the player on the square ([left, right])
+PAWN_ATTACK_SQUARES: Dict[Player, Dict[Square, Tuple[Square, ...]]] = {
+	player: {sq: _offset_squares(sq, ((-1, dy), (1, dy))) for sq in ALL_SQUARES}
+	for player, dy in PAWN_DIRECTION.items()
+}
+# Squares a pawn of the player moves to ([one step forward] and for pawns on initial rank [.., two steps forward])
+PAWN_PUSH_SQUARES: Dict[Player, Dict[Square, Tuple[Square, ...]]] = {
+	player: {sq: _offset_squares(sq, ((0, dy), (0, 2 * dy)) if sq.y == (6 if dy < 0 else 1) else ((0, dy),))
+			 for sq in ALL_SQUARES}
+	for player, dy in PAWN_DIRECTION.items()
+}
+
+BISHOP_RAYS: Dict[Square, Tuple[Ray, ...]] = {sq: tuple(_ray(sq, d) for d in BISHOP_DIRECTIONS) for sq in ALL_SQUARES}
+ROOK_RAYS: Dict[Square, Tuple[Ray, ...]] = {sq: tuple(_ray(sq, d) for d in ROOK_DIRECTIONS) for sq in ALL_SQUARES}
+QUEEN_RAYS: Dict[Square, Tuple[Ray, ...]] = {sq: BISHOP_RAYS[sq] + ROOK_RAYS[sq] for sq in ALL_SQUARES}
+
+
+# Bitboard versions of the tables (indexed by square index `y * 8 + x`, same as `board.BitBoard`)
+
+
+def _mask(squares) -> int:
+	mask = 0
+	for square in squares:
+		mask |= 1 << (square.y * 8 + square.x)
+	return mask
+
+
+KNIGHT_ATTACKS = tuple(_mask(KNIGHT_SQUARES[sq]) for sq in ALL_SQUARES)
+KING_ATTACKS = tuple(_mask(KING_SQUARES[sq]) for sq in ALL_SQUARES)
+PAWN_ATTACKS = {player: tuple(_mask(table[sq]) for sq in ALL_SQUARES) for player, table in PAWN_ATTACK_SQUARES.items()}
+
+
+
+def _ray_masks(rays, directions):
+	return tuple((_mask(ray), dy * 8 + dx > 0) for ray, (dx, dy) in zip(rays, directions))
+
+
+# Masks of the rays from each square (in the order of BISHOP_DIRECTIONS and ROOK_DIRECTIONS),
+# along with whether the ray goes towards higher square indices (first blocker is the lowest set bit).
+BISHOP_RAY_MASKS = tuple(_ray_masks(BISHOP_RAYS[sq], BISHOP_DIRECTIONS) for sq in ALL_SQUARES)
+ROOK_RAY_MASKS = tuple(_ray_masks(ROOK_RAYS[sq], ROOK_DIRECTIONS) for sq in ALL_SQUARES)
@@ -15,6 +15,8 @@ parser.add_argument('--delay', default=1000, type=int, help='delay between moves
 parser.add_argument('--record', default=False, action='store_true', help='record chess game')
 parser.add_argument('--output', default='output.avi',
 					help='file to output recording. must have an .avi extension. default: output.avi ')
+parser.add_argument('--offline', default=False, action='store_true',
+					help='render the recording without a window (faster than real time)')
 args = parser.parse_args()
 
 if not os.path.exists(args.file):
@@ -25,6 +27,7 @@ MOVES_FILE = args.file
 MOVES_DELAY = args.delay
 RECORD_GAME = args.record
 RECORD_FILE = args.output
+RENDER_OFFLINE = args.offline
 
 NEXT_MOVE = pygame.USEREVENT
 
@@ -76,5 +79,31 @@ def game():
 	pygame.quit()
 
 
+def render():
+	# Renders the recording offline, each position is drawn once and held for the delay (in frames).
+	pygame.init()
+	win = pygame.Surface((constants.WIN_WIDTH, constants.WIN_HEIGHT))
+	small_font = pygame.font.Font(None, constants.FONT_SIZE_SMALL)
+	recorder = utils.ScreenRecorder(constants.WIN_WIDTH, constants.WIN_HEIGHT, constants.FPS, RECORD_FILE)
+	hold_frames = max(1, round(MOVES_DELAY * constants.FPS / 1000))
+
+	pieces.load_images()
+	chess_instance = chess.from_initial()
+	renderer = chess.Renderer(win, small_font)
+	move_notations = utils.read_notations(MOVES_FILE)
+	for notation in move_notations:
+		renderer.render(chess_instance)
+		recorder.capture_frame(win, repeat=hold_frames)
+		chess_instance.make_move(utils.Move.from_notation(notation, chess_instance))
+	renderer.render(chess_instance)  # final position
+	recorder.capture_frame(win, repeat=hold_frames)
+	recorder.stop()
+	pygame.quit()
+	print(f'Rendered {len(move_notations)} moves ({(len(move_notations) + 1) * hold_frames} frames) to {RECORD_FILE}')
+
+
 if __name__ == '__main__':
-	game()
+	if RENDER_OFFLINE:
+		render()
+	else:
+		game()
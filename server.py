@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import re
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import chess
+from engine import Engine
+from utils import Move, Player
+
+"""
+Serves many games at once over TCP (one process, asyncio), each connection plays its own game.
+Line based protocol, a command per line and one or more lines in response (errors as `error <message>`).
+	new [fen]                                  -- new game (from the FEN), responds with the status
+	move <move>                                -- move in SAN (`Nf3`) or long algebraic notation (`g1f3`),
+	                                              responds `ok <uci> <san>` and the status
+	undo                                       -- takes back the last move, responds with the status
+	moves                                      -- `moves <uci> ...` legal moves of the player to move
+	status                                     -- `status <turn> <state> <fen>`, state is one of
+	                                              ongoing, check, checkmate, stalemate or draw
+	go [depth <n>] [movetime <s>] [nodes <n>]  -- searches the position (in a worker process),
+	                                              responds `bestmove <uci> score <cp|mate> <n> depth <n> nodes <n>`
+	quit
+Games idle for a while keep only the starting position and the moves (packed, Refer `Move.code`),
+and are rebuilt on the next command. Try it using `nc localhost 8765`.
+python server.py --port 8765 --workers 2
+"""
+
+UCI_PATTERN = re.compile(r'^[a-h][1-8][a-h][1-8][qrbn]?$')
+GAME_CACHE_SIZE = 256  # computed values cached per game (Refer `Memoize`)
+DEFAULT_MOVETIME = 1.0  # seconds
+MAX_MOVETIME = 30.0
+ENGINE_HASH_MB = 16
+
+
+class Game:
+	# Game of a connection, the position is either live (a chess object)
+	# or compact (only the starting position and the moves made since).
+	__slots__ = ('start_fen', 'codes', '_chess', 'last_active')
+
+	def __init__(self, fen: str = chess.INITIAL_FEN):
+		self._chess = chess.from_fen(fen, cache_size=GAME_CACHE_SIZE)
+		self.start_fen = fen
+		self.codes = array('H')  # moves made (Refer `Move.code`)
+		self.last_active = time.monotonic()
+
+	@property
+	def chess(self) -> chess.Chess:
+		self.last_active = time.monotonic()
+		if self._chess is None:  # rebuild the position
+			chess_instance = chess.from_fen(self.start_fen, cache_size=GAME_CACHE_SIZE)
+			for code in self.codes:
+				chess_instance.push(Move.from_code(code, chess_instance))
+			self._chess = chess_instance
+		return self._chess
+
+	@property
+	def compact(self) -> bool:
+		return self._chess is None
+
+	def make_compact(self):
+		self._chess = None
+
+	def push(self, move: Move):
+		self.chess.push(move)
+		self.codes.append(move.code)
+
+	def pop(self) -> Optional[Move]:
+		if not self.codes:
+			return None
+		move = self.chess.pop()  # before the code, a compact game is rebuilt from the codes
+		self.codes.pop()
+		return move
+
+
+def parse_move(notation: str, chess_instance: chess.Chess) -> Move:
+	# Move in long algebraic notation or SAN, raises NotImplementedError (or subclasses) if it cannot be made
+	if UCI_PATTERN.match(notation):
+		return Move.from_uci(notation, chess_instance)
+	return chess.from_san(notation, chess_instance, strict=True)
+
+
+def status_line(chess_instance: chess.Chess) -> str:
+	status = chess_instance.status()
+	if status.checkmate:
+		state = 'checkmate'
+	elif status.stalemate:
+		state = 'stalemate'
+	elif status.draw:
+		state = 'draw'
+	elif status.check:
+		state = 'check'
+	else:
+		state = 'ongoing'
+	turn = 'white' if chess_instance.turn == Player.WHITE else 'black'
+	return f'status {turn} {state} {chess.to_fen(chess_instance)}'
+
+
+def search(fen: str, moves: List[str], depth: Optional[int], movetime: float, nodes: Optional[int]) -> Tuple:
+	# Searches the position (in a worker process), returns the best move (long algebraic notation) and the score
+	result = Engine(chess.from_position(fen, moves), ENGINE_HASH_MB).search(depth, movetime, nodes)
+	score = ('mate', result.mate_in) if result.mate_in is not None else ('cp', result.score)
+	return result.move.uci if result.move else '(none)', score, result.depth, result.nodes
+
+
+class GameServer:
+	def __init__(self, executor: ProcessPoolExecutor, idle_seconds: float = 60.0):
+		self._executor = executor
+		self._idle_seconds = idle_seconds
+		self._games_ = set()  # games of the connections
+
+	async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		game = Game()
+		self._games_.add(game)
+		try:
+			while True:
+				line = await reader.readline()
+				if not line:
+					break
+				command, *args = line.decode(errors='replace').split() or ('',)
+				if command == 'quit':
+					break
+				if command == 'go':
+					response = await self.go(game, args)
+				elif command == 'new':
+					try:
+						game = self._replace_game_(game, Game(' '.join(args)) if args else Game())
+						response = status_line(game.chess)
+					except ValueError as e:
+						response = f'error {e}'
+				else:
+					response = self.respond(game, command, args)
+				writer.write(response.encode() + b'\n')
+				await writer.drain()
+		except ConnectionError:
+			pass
+		finally:
+			self._games_.discard(game)
+			writer.close()
+
+	def _replace_game_(self, game: Game, new_game: Game) -> Game:
+		self._games_.discard(game)
+		self._games_.add(new_game)
+		return new_game
+
+	@staticmethod
+	def respond(game: Game, command: str, args: List[str]) -> str:
+		# Responds to the commands which do not search
+		chess_instance = game.chess
+		if command == 'move' and len(args) == 1:
+			try:
+				move = parse_move(args[0], chess_instance)
+			except NotImplementedError as e:  # unknown notation, illegal (IllegalMoveError) or ambiguous move
+				return f'error {e}'
+			san = chess.to_san(move, chess_instance)
+			game.push(move)
+			status = chess_instance.status()
+			san += '#' if status.checkmate else '+' if status.check else ''
+			return f'ok {move.uci} {san}\n{status_line(chess_instance)}'
+		if command == 'undo':
+			if not game.pop():
+				return 'error No move to undo.'
+			return status_line(chess_instance)
+		if command == 'moves':
+			return ' '.join(['moves'] + [move.uci for move in chess_instance.legal_moves()])
+		if command == 'status':
+			return status_line(chess_instance)
+		return f'error Unknown command {" ".join([command] + args)}.'
+
+	async def go(self, game: Game, args: List[str]) -> str:
+		# Searches in a worker process, so the other games are served meanwhile
+		limits = dict(zip(args[::2], args[1::2]))
+		try:
+			depth = int(limits['depth']) if 'depth' in limits else None
+			nodes = int(limits['nodes']) if 'nodes' in limits else None
+			movetime = min(float(limits.get('movetime', DEFAULT_MOVETIME)), MAX_MOVETIME)
+		except ValueError:
+			return f'error Invalid limits {" ".join(args)}.'
+		fen, moves = game.chess.position()
+		loop = asyncio.get_running_loop()
+		uci, (kind, score), depth, nodes = await loop.run_in_executor(
+			self._executor, search, fen, moves, depth, movetime, nodes)
+		return f'bestmove {uci} score {kind} {score} depth {depth} nodes {nodes}'
+
+	async def compact_idle_games(self, interval: float = 10.0):
+		# Periodically makes the games idle for a while compact
+		while True:
+			await asyncio.sleep(interval)
+			now = time.monotonic()
+			for game in self._games_:
+				if not game.compact and now - game.last_active >= self._idle_seconds:
+					game.make_compact()
+
+	async def serve(self, host: str, port: int):
+		server = await asyncio.start_server(self.handle, host, port)
+		compaction = asyncio.create_task(self.compact_idle_games())
+		print(f'Serving games on {", ".join(str(sock.getsockname()) for sock in server.sockets)}')
+		try:
+			async with server:
+				await server.serve_forever()
+		finally:
+			compaction.cancel()
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--host', default='127.0.0.1', help='address to listen on. default `127.0.0.1`')
+	parser.add_argument('--port', default=8765, type=int, help='port to listen on. default `8765`')
+	parser.add_argument('--workers', default=None, type=int, help='processes searching. default number of cpus')
+	parser.add_argument('--idle', default=60.0, type=float,
+						help='seconds after which an idle game is made compact. default `60`')
+	args = parser.parse_args()
+
+	with ProcessPoolExecutor(args.workers) as executor:
+		try:
+			asyncio.run(GameServer(executor, args.idle).serve(args.host, args.port))
+		except KeyboardInterrupt:
+			pass
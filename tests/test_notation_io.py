@@ -0,0 +1,32 @@
+import unittest
+
+from utils.notation_io import parse_pgn
+
+"""
+Run from the project root using
+python -m pytest tests
+"""
+
+
+def games(text: str):
+	return list(parse_pgn(text.splitlines(keepends=True)))
+
+
+class ParsePGNTest(unittest.TestCase):
+	def test_result_in_rest_of_line_comment(self):
+		parsed = games('[Event "A"]\n[Result "1-0"]\n\n'
+					   '1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 ; rest 0-1\n'
+					   '4. Ba4 1-0\n')
+		self.assertEqual(len(parsed), 1)
+		self.assertEqual(parsed[0].moves, ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6', 'Ba4'])
+		self.assertEqual(parsed[0].result, '1-0')
+
+	def test_castling_with_zeros(self):
+		parsed = games('1. e4 e5 2. Nf3 Nc6 3. Bc4 Bc5 4. 0-0 Nf6 5. d3 d6 6. Be3 Qe7 7. Nc3 Bd7 8. a3 0-0-0+ *\n')
+		self.assertEqual(parsed[0].moves[6:8], ['O-O', 'Nf6'])
+		self.assertEqual(parsed[0].moves[-1], 'O-O-O+')
+		self.assertEqual(parsed[0].result, '*')
+
+
+if __name__ == '__main__':
+	unittest.main()
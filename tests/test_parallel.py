@@ -0,0 +1,30 @@
+import unittest
+
+import chess
+from engine import Engine, ParallelEngine
+
+"""
+Run from the project root using
+python -m pytest tests
+"""
+
+POSITIONS = [
+	'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3',
+	'8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+	'6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1',  # mate in one
+]
+
+
+class ParallelEngineTest(unittest.TestCase):
+	def test_same_score_as_engine(self):
+		with ParallelEngine(2, hash_mb=1) as engine:
+			for fen in POSITIONS:
+				with self.subTest(fen=fen):
+					expected = Engine(chess.from_fen(fen), hash_mb=1).search(depth=3)
+					result = engine.search(chess.from_fen(fen), depth=3)
+					self.assertEqual(result.score, expected.score)
+					self.assertEqual(result.move.uci, expected.move.uci)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+import chess
+from server import Game, parse_move
+
+"""
+Run from the project root using
+python -m pytest tests
+"""
+
+
+def played(notations) -> Game:
+	game = Game()
+	for notation in notations:
+		game.push(parse_move(notation, game.chess))
+	return game
+
+
+class GamePopTest(unittest.TestCase):
+	def test_pop_compact_game(self):
+		game = played(['e4', 'e5', 'Nf3'])
+		game.make_compact()
+		self.assertEqual(game.pop().uci, 'g1f3')
+		self.assertEqual(len(game.codes), 2)
+		self.assertEqual(chess.to_fen(game.chess), chess.to_fen(played(['e4', 'e5']).chess))
+
+	def test_pop_compact_game_of_one_move(self):
+		game = played(['d4'])
+		game.make_compact()
+		self.assertEqual(game.pop().uci, 'd2d4')
+		self.assertEqual(len(game.codes), 0)
+		self.assertEqual(chess.to_fen(game.chess), chess.INITIAL_FEN)
+		self.assertIsNone(game.pop())
+
+
+if __name__ == '__main__':
+	unittest.main()
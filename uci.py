@@ -0,0 +1,182 @@
+import sys
+import threading
+from typing import List, Optional
+
+import chess
+from engine import Engine, OpeningBook, SearchResult
+from utils import Move, Player
+
+"""
+Universal Chess Interface (UCI), to play using chess GUIs and tournament managers (like cutechess-cli).
+Reads commands from stdin and writes responses to stdout, searching in a separate thread (so `stop` is handled).
+Configure the GUI to run `python uci.py` (from the project root).
+"""
+
+ENGINE_NAME = 'pychess'
+ENGINE_AUTHOR = 'tdrmk'
+DEFAULT_HASH_MB = 16
+MOVES_TO_GO = 30  # moves assumed left in the game, when the GUI does not say
+MOVE_OVERHEAD = 0.05  # seconds kept for communication
+
+
+def send(line: str):
+	print(line, flush=True)
+
+
+def info_line(result: SearchResult) -> str:
+	score = f'mate {result.mate_in}' if result.mate_in is not None else f'cp {result.score}'
+	return f'info depth {result.depth} score {score} nodes {result.nodes} nps {result.nps} ' \
+		   f'time {int(result.elapsed * 1000)} pv {" ".join(move.uci for move in result.pv)}'
+
+
+def parse_limits(args: List[str]) -> dict:
+	# `go` parameters -- wtime, btime, winc, binc, movestogo, depth, nodes and movetime are numbers, infinite is a flag
+	limits, i = {}, 0
+	while i < len(args):
+		if args[i] == 'infinite':
+			limits['infinite'] = True
+		elif i + 1 < len(args) and args[i + 1].lstrip('-').isdigit():
+			limits[args[i]] = int(args[i + 1])
+			i += 1
+		i += 1
+	return limits
+
+
+def time_for_move(limits: dict, turn: Player) -> Optional[float]:
+	# Time (in seconds) to search, None if not limited by time
+	if 'movetime' in limits:
+		return limits['movetime'] / 1000
+	remaining = limits.get('wtime' if turn == Player.WHITE else 'btime')
+	if remaining is None:
+		return None
+	increment = limits.get('winc' if turn == Player.WHITE else 'binc', 0)
+	remaining, increment = remaining / 1000, increment / 1000
+	movetime = remaining / limits.get('movestogo', MOVES_TO_GO) + 0.75 * increment
+	return max(min(movetime, remaining - MOVE_OVERHEAD), 0.01)
+
+
+class UCI:
+	def __init__(self):
+		self._hash_mb = DEFAULT_HASH_MB
+		self._chess: chess.Chess = None
+		self._engine: Engine = None
+		self._start_fen: str = None
+		self._moves: List[str] = []  # moves made from the starting position (long algebraic notation)
+		self._search_thread: threading.Thread = None
+		self._stop_requested: threading.Event = None  # set by `stop` (or `quit`), ends infinite searches
+		self._book: OpeningBook = None  # moves are played from the book (if set) without searching
+		self.new_game()
+
+	def new_game(self):
+		self.set_position(chess.INITIAL_FEN, [])
+		self._engine = Engine(self._chess, self._hash_mb)
+
+	def set_position(self, fen: str, moves: List[str]):
+		# Makes only the moves after those common with the current position (GUIs resend the whole game each move)
+		if fen != self._start_fen:
+			self._chess, self._start_fen, self._moves = chess.from_fen(fen), fen, []
+			self._engine = Engine(self._chess, self._hash_mb)
+		common = 0
+		while common < min(len(moves), len(self._moves)) and moves[common] == self._moves[common]:
+			common += 1
+		while len(self._moves) > common:  # moves taken back
+			self._chess.pop()
+			self._moves.pop()
+		for notation in moves[common:]:
+			self._chess.push(Move.from_uci(notation, self._chess))
+			self._moves.append(notation)
+
+	def set_book(self, file: str):
+		book = OpeningBook(file) if file else None  # the current book is kept if the file cannot be opened
+		if self._book:
+			self._book.close()
+		self._book = book
+
+	def go(self, args: List[str]):
+		limits = parse_limits(args)
+		infinite = limits.get('infinite', False)
+		movetime = None if infinite else time_for_move(limits, self._chess.turn)
+		depth, nodes = limits.get('depth'), limits.get('nodes')
+		book_move = self._book.choose(self._chess) if self._book else None
+		stop_requested = self._stop_requested = threading.Event()
+
+		def search():
+			if book_move:
+				move = book_move
+			else:
+				move = self._engine.search(depth, movetime, nodes, info=lambda result: send(info_line(result))).move
+			if infinite:  # best move only after `stop` (or `quit`), even if the search ended by itself (like mate)
+				stop_requested.wait()
+			send(f'bestmove {move.uci if move else "0000"}')
+
+		self._search_thread = threading.Thread(target=search, daemon=True)
+		self._search_thread.start()
+
+	def stop(self):
+		# Stops the search (if any) and waits for its best move
+		if self._stop_requested:
+			self._stop_requested.set()
+		while self._search_thread and self._search_thread.is_alive():
+			self._engine.stop()
+			self._search_thread.join(0.01)
+		self._search_thread = None
+
+	def wait(self):
+		# Waits for the search (if any) to complete, the position must not change while searching
+		if self._search_thread:
+			self._search_thread.join()
+			self._search_thread = None
+
+	def handle(self, line: str) -> bool:
+		# Handles a command, returns False on quit
+		command, *args = line.split() or ('',)
+		if command == 'uci':
+			send(f'id name {ENGINE_NAME}')
+			send(f'id author {ENGINE_AUTHOR}')
+			send(f'option name Hash type spin default {DEFAULT_HASH_MB} min 1 max 1024')
+			send('option name BookFile type string default <empty>')
+			send('uciok')
+		elif command == 'isready':
+			send('readyok')
+		elif command == 'setoption':
+			self.wait()
+			# setoption name Hash value 64
+			if args and args[0] == 'name' and 'value' in args:
+				name, value = ' '.join(args[1:args.index('value')]).lower(), ' '.join(args[args.index('value') + 1:])
+				if name == 'hash':
+					self._hash_mb = int(value)
+					self._engine = Engine(self._chess, self._hash_mb)
+				elif name == 'bookfile':
+					self.set_book('' if value == '<empty>' else value)
+		elif command == 'ucinewgame':
+			self.wait()
+			self.new_game()
+		elif command == 'position':
+			self.wait()
+			moves = args[args.index('moves') + 1:] if 'moves' in args else []
+			fields = args[:args.index('moves')] if 'moves' in args else args
+			if fields and fields[0] == 'startpos':
+				self.set_position(chess.INITIAL_FEN, moves)
+			elif fields and fields[0] == 'fen':
+				self.set_position(' '.join(fields[1:]), moves)
+		elif command == 'go':
+			self.wait()
+			self.go(args)
+		elif command == 'stop':
+			self.stop()
+		elif command == 'quit':
+			self.stop()
+			return False
+		return True
+
+	def run(self):
+		for line in sys.stdin:
+			try:
+				if not self.handle(line):
+					break
+			except (ValueError, NotImplementedError, OSError) as e:  # malformed FEN, illegal move or missing book
+				send(f'info string error {e}')
+
+
+if __name__ == '__main__':
+	UCI().run()
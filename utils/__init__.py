@@ -1,7 +1,15 @@
-from .move import Move
+from .move import Move, IllegalMoveError, AmbiguousMoveError
 from .player import Player
 from .square import Square
-from .memoize import Memoize
+from .memoize import Memoize, CacheInfo
 from .history import History
-from .notation_io import read_notations, write_notations
-from .recorder import ScreenRecorder
\ No newline at end of file
+from .notation_io import read_notations, write_notations, read_pgn, parse_pgn, write_pgn, format_pgn, PGNGame
+from .lazy import lazy_import
+
+
+def __getattr__(name):
+	# ScreenRecorder (and with it cv2) is imported only when used (Refer `lazy.py`)
+	if name == 'ScreenRecorder':
+		from .recorder import ScreenRecorder
+		return ScreenRecorder
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
\ No newline at end of file
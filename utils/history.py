@@ -9,7 +9,7 @@ class History(Generic[T]):
 		self._index_ = 0
 
 	def push(self, item: T):
-		self._entries_ = self._entries_[:self._index_]
+		del self._entries_[self._index_:]
 		self._entries_.append(item)
 		self._index_ += 1
 
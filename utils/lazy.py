@@ -0,0 +1,28 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+"""
+Modules imported on first use, so the rules (board, pieces, chess) import without the GUI and video libraries.
+Usage (at module level): pygame = lazy_import('pygame'), the library is imported when an attribute is first accessed.
+"""
+
+
+class MissingModule(ModuleType):
+	# Stands for a module which is not installed, raises when used (instead of when imported)
+	def __getattr__(self, item):
+		raise ModuleNotFoundError(f'No module named {self.__name__!r}', name=self.__name__)
+
+
+def lazy_import(name: str) -> ModuleType:
+	if name in sys.modules:
+		return sys.modules[name]
+	spec = importlib.util.find_spec(name)
+	if spec is None:
+		return MissingModule(name)
+	loader = importlib.util.LazyLoader(spec.loader)
+	spec.loader = loader
+	module = importlib.util.module_from_spec(spec)
+	sys.modules[name] = module
+	loader.exec_module(module)
+	return module
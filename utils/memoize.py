@@ -1,32 +1,47 @@
-from collections import defaultdict
+from collections import OrderedDict, namedtuple
 from functools import wraps
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'size', 'max_size'])
+
+_missing = object()
+
 
 class Memoize:
-	def __init__(self):
-		self._stored_values_ = dict()
+	# Bounded store of computed values, evicts the least recently used values when full.
+	def __init__(self, max_size: int = 4096):
+		self._stored_values_ = OrderedDict()
+		self.max_size = max_size
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
 
-	def memoize(self, _fn):
+	@staticmethod
+	def memoize(_fn):
+		# Decorator for methods of objects having a `_cache_` (Memoize instance) and a `cache_key`
+		# (identifying the object's current state). Values are stored against the state and the arguments,
+		# so they remain valid when the object returns to a previous state.
 		@wraps(_fn)
-		def wrapper(*args):
-			key = (_fn.__name__, *args)
-			if key in self._stored_values_:
-				return_value = self._stored_values_[key]
-				# print('Returning memoized value', _fn.__name__)
+		def wrapper(self, *args):
+			cache: Memoize = self._cache_
+			stored_values = cache._stored_values_
+			key = (_fn.__name__, self.cache_key, *args)
+			return_value = stored_values.get(key, _missing)
+			if return_value is not _missing:
+				stored_values.move_to_end(key)
+				cache.hits += 1
 				return return_value
-			return_value = _fn(*args)
-			# print('Memoizing', key)
-			self._stored_values_[key] = return_value
+			cache.misses += 1
+			return_value = _fn(self, *args)
+			stored_values[key] = return_value
+			if len(stored_values) > cache.max_size:
+				stored_values.popitem(last=False)  # least recently used
+				cache.evictions += 1
 			return return_value
 
 		return wrapper
 
-	def invalidate(self, _fn):
-		@wraps(_fn)
-		def wrapper(*args):
-			# remove all entries
-			# print('Invalidate', _fn.__name__)
-			self._stored_values_.clear()
-			return _fn(*args)
+	def clear(self):
+		self._stored_values_.clear()
 
-		return wrapper
+	def info(self) -> CacheInfo:
+		return CacheInfo(self.hits, self.misses, self.evictions, len(self._stored_values_), self.max_size)
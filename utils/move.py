@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import re
-from collections import Counter
 from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
@@ -14,7 +12,27 @@ if TYPE_CHECKING:
 	from chess import Chess
 
 
+class IllegalMoveError(NotImplementedError):
+	# Move (notation) cannot be made in the position
+	pass
+
+
+class AmbiguousMoveError(NotImplementedError):
+	# Move (notation) can be made by more than one piece
+	pass
+
+
+# Packed move (16 bits): from square index (6) | to square index (6) | promotion piece (3), square index is `y * 8 + x`
+PROMOTION_CODES = {'Q': 1, 'R': 2, 'B': 3, 'N': 4}
+
+
 class Move:
+	# Moves are created for every pseudo-legal move generated, slots avoid a dictionary per move.
+	__slots__ = ('player', 'piece', 'old_square', 'new_square', 'piece_moved', 'captured_piece',
+				 'en_passant_pawn', 'en_passant_pawn_square', 'en_passant_pawn_moved',
+				 'castle_rook', 'rook_old_square', 'rook_new_square', 'rook_moved',
+				 'pawn_promoted', 'new_piece', 'notation')
+
 	def __init__(self,
 				 player: Player,
 				 # Typical move -- with capture piece, if any
@@ -106,91 +124,56 @@ class Move:
 		return cls(player, piece, old_square, new_square, piece_moved, captured_piece, pawn_promoted=True,
 				   new_piece=new_piece)
 
+	@property
+	def uci(self) -> str:
+		# long algebraic notation (as used by UCI), like `e2e4` or `e7e8q` (promotion)
+		promoted = self.new_piece.notation.lower() if self.pawn_promoted and self.new_piece else ''
+		return f'{self.old_square.notation}{self.new_square.notation}{promoted}'
+
+	@property
+	def code(self) -> int:
+		# Packs the squares (and promotion) of the move into 16 bits, never zero for a move.
+		# Compact form for storing moves (like in transposition tables and opening books), Refer `from_code`.
+		old_square, new_square = self.old_square, self.new_square
+		promotion = PROMOTION_CODES[self.new_piece.notation] if self.pawn_promoted and self.new_piece else 0
+		return (old_square.y * 8 + old_square.x) | (new_square.y * 8 + new_square.x) << 6 | promotion << 12
+
 	@contextmanager
 	def update_notation(self, chess: Chess, indicate_enpassant: bool = False):
 		# Context manager to update notation of the move.
 		# Notation needs the state of the chess before applying the move (like to resolve ambiguity in pieces)
 		# and after applying the move (game status like check, checkmate).
+		from chess.san import to_san
 
 		###### BEFORE APPLYING MOVE	###########
-		if self.castle_rook:  # in case of castling -- use special notation
-			if self.new_square.x == 6:  # king side castling
-				self.notation = 'O-O'
-			else:  # self.new_square.x == 2	--  queen side castling
-				self.notation = 'O-O-O'
-		else:
-			n_piece = self.piece.notation  # the piece, note in case of pawn, nothing
-			n_square = self.new_square.notation  # the destination square
-			n_captured = 'x' if self.captured_piece or self.en_passant_pawn else ''  # if capture (including enpassant)
-			n_promoted = f'={self.new_piece.notation}' if self.pawn_promoted else ''  # if pawn promotion, the new piece
-			n_enpassant = '(ep)' if indicate_enpassant and self.en_passant_pawn else ''  # in case of enpassant
-			# if other pieces (of same type) can move to same square, `n_ambiguity` is used for resolving the piece
-			n_ambiguity = ''  # if other pieces () also can move to same
-			if not n_piece and n_captured:  # if pawn captures a piece, specify file
-				n_piece = self.old_square.notation[0]
-			elif n_piece:  # if not pawn
-				# if two different pieces of the same type could move to the same square,
-				# to resolve the ambiguity of which piece had moved, we use the file (x in square) or rank (y in square)
-				# to uniquely identify the piece
-				other_pieces = [piece for piece in chess.board[type(self.piece)][self.player] if piece != self.piece and
-								any(move for move in piece.possible_moves() if move.new_square == self.new_square)]
-				if other_pieces:
-					counter = Counter(''.join([piece.square.notation for piece in other_pieces]))
-					if self.old_square.notation[0] not in counter:
-						n_ambiguity = self.old_square.notation[0]
-					else:
-						assert self.old_square.notation[1] not in counter
-						n_ambiguity = self.old_square.notation[1]
-			self.notation = f"{n_piece}{n_ambiguity}{n_captured}{n_square}{n_promoted}{n_enpassant}"
+		self.notation = to_san(self, chess, indicate_enpassant)
 
 		yield
 		###### AFTER APPLYING MOVE
-		if chess.is_checkmate():
-			self.notation += '#'
-		elif chess.is_check():
-			self.notation += '+'
+		if chess.is_check():
+			self.notation += '#' if chess.is_checkmate() else '+'
+
+	@classmethod
+	def from_uci(cls, notation: str, chess: Chess):
+		# obtain the (valid) move from long algebraic notation, like `e2e4` or `e7e8q` (Refer `uci`)
+		for move in chess.legal_moves():
+			if move.uci == notation:
+				return move
+		raise NotImplementedError(f'No piece can make move {notation}.')
+
+	@classmethod
+	def from_code(cls, code: int, chess: Chess):
+		# obtain the (valid) move from the packed move (Refer `code`)
+		for move in chess.legal_moves():
+			if move.code == code:
+				return move
+		raise NotImplementedError(f'No piece can make move {code:#06x}.')
 
 	@classmethod
-	def from_notation(cls, notation: str, chess: Chess):
-		# obtain the move from the notation
-		# WARNING: move must be valid -- it does not check for errors.
-		import pieces
-		player = chess.turn
-		# Maps notation to piece.
-		notation2piece = {
-			'K': pieces.King,
-			'Q': pieces.Queen,
-			'R': pieces.Rook,
-			'B': pieces.Bishop,
-			'N': pieces.Knight,
-			None: pieces.Pawn,
-		}
-		match = re.match('^O-O(?P<queen_side>-O)?[+#]?$', notation)
-		if match:  # handling special case of castling.
-			king = chess[pieces.King][player][0]
-			if match.group('queen_side'):
-				rook = chess[Square(0, king.square.y)]
-				return cls.castle(chess.board, king=king, new_king_square=Square(2, king.square.y), rook=rook,
-								  new_rook_square=Square(3, king.square.y))
-			else:
-				rook = chess[Square(7, king.square.y)]
-				return cls.castle(chess.board, king=king, new_king_square=Square(6, king.square.y), rook=rook,
-								  new_rook_square=Square(5, king.square.y))
-
-		match = re.match(
-			'^(?P<piece>[NBRQK])?(?P<ambiguity>[a-h]|[1-8])?(?P<captured>x)?(?P<square>[a-h][1-8])'
-			'(=(?P<promoted>[NBRQ]))?(?P<enpassant>\(ep\))?([+#])?$',
-			notation)
-		if match:  # in case of any other move
-			piece_cls = notation2piece[match.group('piece')]  # get the piece type being moved
-			new_square = Square.from_notation(match.group('square'))  # get the new_square piece is intended to move
-			ambiguity = match.group('ambiguity')  # get the file/rank to resolve ambiguity (if any)
-			for piece in chess[piece_cls][player]:  # for each piece of the piece of specified type
-				for move in piece.possible_moves():  # get all possible moves
-					if move.new_square == new_square:  # if there is a match in destination square
-						if not ambiguity or ambiguity in move.old_square.notation:  # if piece is the one indicated
-							if match.group('promoted'):  # in case of promotion, create the new_piece
-								move.new_piece = notation2piece[match.group('promoted')](player, chess.board)
-							return move  # Found it
-			raise NotImplementedError(f'No piece can make move {notation}.')
-		raise NotImplementedError(f'Unknown Notation. Cannot parse notation {notation}.')
+	def from_notation(cls, notation: str, chess: Chess, strict: bool = False):
+		# obtain the move from the notation (Refer `chess.san`)
+		# WARNING: unless strict, move must be valid -- it does not check for errors.
+		# strict -- raises IllegalMoveError if the move cannot be made (like leaving the king in check)
+		# and AmbiguousMoveError if more than one piece can make the move.
+		from chess.san import from_san
+		return from_san(notation, chess, strict)
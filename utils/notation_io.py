@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from typing import List
+import bz2
+import gzip
+import re
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, Iterator, List, TextIO, Tuple
 
 from .move import Move
 
@@ -57,3 +61,155 @@ def read_notations(file: str = 'moves.txt') -> List[str]:
 			_, *moves = line.split()
 			move_notations.extend(moves)
 	return move_notations
+
+
+"""
+Portable Game Notation (PGN) archives, a sequence of games each with tag pairs followed by movetext.
+Sample:
+[Event "Casual Game"]
+[White "Anderssen"]
+[Black "Kieseritzky"]
+[Result "1-0"]
+
+1. e4 e5 2. f4 exf4 {King's Gambit} 3. Bc4 Qh4+ (3... d5) 4. Kf1 $1 b5 ... 23. Be7# 1-0
+
+Games are read one at a time (memory does not grow with the archive), comments, variations and
+numeric annotation glyphs (NAGs) are skipped and only the main line is returned.
+"""
+
+PGNGame = namedtuple('PGNGame', ['headers', 'moves', 'result'])  # tag pairs, SAN notations of main line and result
+
+PGN_TAG = re.compile(r'^\[\s*(?P<name>\w+)\s+"(?P<value>(?:[^"\\]|\\.)*)"\s*\]\s*$')
+PGN_TOKEN = re.compile(r"""
+	(?P<comment>\{[^}]*\}|;[^\n]*)
+	|(?P<open>\()|(?P<close>\))
+	|(?P<nag>\$\d+)
+	|(?P<result>1-0|0-1|1/2-1/2|\*)
+	|(?P<number>\d+\.+)
+	|(?P<move>[a-zA-Z][\w=+#-]*|0-0(?:-0)?[+#]?)(?:[!?]+)?
+""", re.VERBOSE)
+PGN_RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+PGN_LINE_LENGTH = 80  # movetext is wrapped (when writing)
+
+
+def open_notations(file: str) -> TextIO:
+	# Opens the file for reading text, decompressing gzip (`.gz`) or bzip2 (`.bz2`) files.
+	if file.endswith('.gz'):
+		return gzip.open(file, 'rt', encoding='utf-8', errors='replace')
+	if file.endswith('.bz2'):
+		return bz2.open(file, 'rt', encoding='utf-8', errors='replace')
+	return open(file, encoding='utf-8', errors='replace')
+
+
+def read_pgn(file: str, header_filter: Callable[[Dict[str, str]], bool] = None) -> Iterator[PGNGame]:
+	# Yields the games of the PGN file (optionally compressed) one at a time.
+	# header_filter -- called with the tag pairs of each game, movetext of games it rejects is skipped without parsing
+	with open_notations(file) as f:
+		yield from parse_pgn(f, header_filter)
+
+
+def parse_pgn(lines: Iterator[str], header_filter: Callable[[Dict[str, str]], bool] = None) -> Iterator[PGNGame]:
+	# Yields the games from the lines of PGN text, refer `read_pgn`.
+	headers, movetext, in_comment = {}, None, False  # movetext is None until it starts
+	skip = False  # whether the movetext of the current game is skipped (rejected by header filter)
+	for line in lines:
+		if line.startswith('%'):  # escaped line
+			continue
+		stripped = line.strip()
+		if not stripped:
+			continue
+		if not in_comment and stripped.startswith('['):
+			if movetext is not None:  # movetext ended without a termination marker
+				if not skip:
+					yield _make_game_(headers, movetext)
+				headers, movetext = {}, None
+			match = PGN_TAG.match(stripped)
+			if match:
+				headers[match.group('name')] = re.sub(r'\\(.)', r'\1', match.group('value'))
+			continue
+		if movetext is None:
+			movetext, skip = [], bool(header_filter) and not header_filter(headers)
+		if not skip:
+			movetext.append(line)
+		# a tag pair inside a (multi line) comment is not a new game
+		in_comment, movetext_end = _in_comment_(line, in_comment)
+		if not in_comment and line[:movetext_end].rstrip().endswith(PGN_RESULTS):  # termination marker ends the game
+			if not skip:
+				yield _make_game_(headers, movetext)
+			headers, movetext = {}, None
+	if movetext is not None and not skip:
+		yield _make_game_(headers, movetext)
+
+
+def _in_comment_(line: str, in_comment: bool) -> Tuple[bool, int]:
+	# Returns whether a brace comment is still open at the end of the line,
+	# and where the rest of line comment (`;`) starts (length of the line if none).
+	index = 0
+	while True:
+		if in_comment:
+			index = line.find('}', index)
+		else:
+			index, rest_of_line = line.find('{', index), line.find(';', index)  # `;` comments the rest of line
+			if 0 <= rest_of_line and (index < 0 or rest_of_line < index):
+				return False, rest_of_line
+		if index < 0:
+			return in_comment, len(line)
+		in_comment, index = not in_comment, index + 1
+
+
+def _make_game_(headers: Dict[str, str], movetext: List[str]) -> PGNGame:
+	moves, result, depth = [], headers.get('Result', '*'), 0
+	for match in PGN_TOKEN.finditer(''.join(movetext)):
+		kind = match.lastgroup
+		if kind == 'open':
+			depth += 1
+		elif kind == 'close':
+			depth -= 1
+		elif depth:  # inside a variation
+			continue
+		elif kind == 'move':
+			notation = match.group('move')
+			moves.append(notation.replace('0', 'O') if notation.startswith('0') else notation)  # castling with zeros
+		elif kind == 'result':
+			result = match.group('result')
+	return PGNGame(headers, moves, result)
+
+
+def format_pgn(game: PGNGame) -> str:
+	# Returns the PGN text of the game, tag pairs (in order) followed by the movetext (wrapped) and the result.
+	# Move numbers start from the `FEN` tag pair (if any), like `12... Nf6` when black moves first.
+	tags = ''.join(f'[{name} "{_escape_(value)}"]\n' for name, value in game.headers.items())
+	fields = game.headers.get('FEN', '').split()
+	number = int(fields[5]) if len(fields) == 6 and fields[5].isdigit() else 1
+	black_to_move = len(fields) > 1 and fields[1] == 'b'
+
+	tokens = []
+	for index, notation in enumerate(game.moves, start=black_to_move):
+		if index % 2 == 0:
+			tokens.append(f'{number + index // 2}.')
+		elif black_to_move and index == 1:  # black moves first
+			tokens.append(f'{number}...')
+		tokens.append(notation)
+	tokens.append(game.result)
+
+	lines, line = [], ''
+	for token in tokens:
+		if line and len(line) + 1 + len(token) > PGN_LINE_LENGTH:
+			lines.append(line)
+			line = token
+		else:
+			line = f'{line} {token}' if line else token
+	lines.append(line)
+	return tags + '\n' + '\n'.join(lines) + '\n'
+
+
+def _escape_(value: str) -> str:
+	return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def write_pgn(games: Iterable[PGNGame], file: str, mode: str = 'w'):
+	# Writes the games to the PGN file, separated by a blank line (Refer `format_pgn`).
+	# mode -- 'a' to append to an existing archive
+	with open(file, mode, encoding='utf-8') as f:
+		for game in games:
+			f.write(format_pgn(game) + '\n')
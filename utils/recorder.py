@@ -1,4 +1,5 @@
 import cv2
+import numpy as np
 import pygame
 
 
@@ -9,11 +10,17 @@ class ScreenRecorder:
 		four_cc = cv2.VideoWriter_fourcc(*'XVID')
 		self.video = cv2.VideoWriter(out_file, four_cc, float(fps), (width, height))
 
-	def capture_frame(self, surf):
-		pixels = cv2.rotate(pygame.surfarray.pixels3d(surf), cv2.ROTATE_90_CLOCKWISE)
-		pixels = cv2.flip(pixels, 1)
-		pixels = cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR)
-		self.video.write(pixels)
+	@staticmethod
+	def frame(surf):
+		# (height, width) BGR view of the surface pixels (no copy), surfarray is indexed (x, y) and in RGB order
+		return pygame.surfarray.pixels3d(surf).transpose(1, 0, 2)[:, :, ::-1]
+
+	def capture_frame(self, surf, repeat=1):
+		# repeat -- number of frames the surface is held for (it is converted once)
+		# the view is copied into a contiguous array once, instead of by the writer for each frame
+		pixels = np.ascontiguousarray(self.frame(surf))
+		for _ in range(repeat):
+			self.video.write(pixels)
 
 	def stop(self):
 		self.video.release()
@@ -0,0 +1,128 @@
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+import chess
+from utils import Move, IllegalMoveError, AmbiguousMoveError, read_pgn, read_notations
+
+"""
+Validates (replays) games without a display, distributing the games across processes.
+Takes a PGN archive (optionally `.gz` or `.bz2` compressed), a notation file (Refer `utils.notation_io`)
+or a directory of them, reports moves which are illegal or ambiguous (with game and ply) and the throughput.
+Games with a `FEN` tag pair are replayed from that position.
+python validate.py games.pgn.gz --workers 8
+"""
+
+PGN_EXTENSIONS = ('.pgn', '.pgn.gz', '.pgn.bz2')
+NOTATION_EXTENSIONS = ('.txt',)
+CHUNK_SIZE = 64  # games sent to a worker at a time
+
+# identifies the game (file, index and players), starting position (FEN, None for the initial) and notations of the moves
+Game = Tuple[str, Optional[str], List[str]]
+# error kind ('illegal', 'ambiguous', 'unknown' or 'position' (invalid FEN)), ply (starting at 1), notation and message
+GameError = Tuple[str, int, str, str]
+
+
+def game_files(path: str) -> List[str]:
+	# Returns the files with games, the path itself or files in the directory (sorted)
+	if not os.path.isdir(path):
+		return [path]
+	return [os.path.join(path, name) for name in sorted(os.listdir(path))
+			if name.endswith(PGN_EXTENSIONS + NOTATION_EXTENSIONS)]
+
+
+def read_games(path: str) -> Iterator[Game]:
+	# Yields the games (one at a time) from the files of the path
+	for file in game_files(path):
+		if file.endswith(NOTATION_EXTENSIONS):
+			yield file, None, read_notations(file)
+			continue
+		for index, game in enumerate(read_pgn(file), start=1):
+			players = f"{game.headers.get('White', '?')} vs {game.headers.get('Black', '?')}"
+			yield f'{file} game {index} ({players})', game.headers.get('FEN'), game.moves
+
+
+def replay_game(notations: List[str], fen: str = None) -> Tuple[int, Optional[GameError]]:
+	# Replays the game from the position (FEN, default initial), returns the plies replayed and the error (if any).
+	# Moves are made without computing their notation and the game status (only legality is validated).
+	try:
+		chess_instance = chess.from_fen(fen) if fen else chess.from_initial()
+	except ValueError as e:
+		return 0, ('position', 0, fen, str(e))
+	for ply, notation in enumerate(notations, start=1):
+		try:
+			move = Move.from_notation(notation, chess_instance, strict=True)
+		except IllegalMoveError as e:
+			return ply - 1, ('illegal', ply, notation, str(e))
+		except AmbiguousMoveError as e:
+			return ply - 1, ('ambiguous', ply, notation, str(e))
+		except NotImplementedError as e:
+			return ply - 1, ('unknown', ply, notation, str(e))
+		chess_instance.push(move)
+	return len(notations), None
+
+
+def replay_games(games: List[Game]) -> List[Tuple[str, int, Optional[GameError]]]:
+	# Replays a chunk of games (in a worker process)
+	return [(name, *replay_game(notations, fen)) for name, fen, notations in games]
+
+
+def chunks(games: Iterator[Game], size: int) -> Iterator[List[Game]]:
+	while True:
+		chunk = list(islice(games, size))
+		if not chunk:
+			return
+		yield chunk
+
+
+def validate(path: str, workers: int = None, print_errors: bool = True) -> Counter:
+	# Replays all the games of the path, prints the errors and summary, returns the counts of games and errors.
+	counts, start = Counter(), time.perf_counter()
+	workers = workers or os.cpu_count()
+
+	def report(results):
+		for name, plies, error in results:
+			counts['games'] += 1
+			counts['plies'] += plies
+			if error:
+				kind, ply, notation, message = error
+				counts[kind] += 1
+				if print_errors and kind == 'position':
+					print(f'{name}: invalid starting position. {message}')
+				elif print_errors:
+					print(f'{name}: ply {ply} {kind} move {notation}. {message}')
+
+	with ProcessPoolExecutor(workers) as executor:
+		# Bounded number of chunks in flight, so the games are read as they are replayed
+		pending = set()
+		for chunk in chunks(read_games(path), CHUNK_SIZE):
+			if len(pending) >= 2 * workers:
+				done, pending = wait(pending, return_when=FIRST_COMPLETED)
+				for future in done:
+					report(future.result())
+			pending.add(executor.submit(replay_games, chunk))
+		for future in pending:
+			report(future.result())
+
+	elapsed = time.perf_counter() - start
+	print(f"{counts['games']} games ({counts['illegal']} illegal, {counts['ambiguous']} ambiguous, "
+		  f"{counts['unknown']} unknown notation, {counts['position']} invalid position), "
+		  f"{counts['plies']} plies in {elapsed:.2f}s ({counts['games'] / elapsed:.1f} games/s, {counts['plies'] / elapsed:.0f} plies/s)")
+	return counts
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('path', help='PGN archive (optionally compressed), notation file or a directory of them')
+	parser.add_argument('--workers', default=None, type=int, help='number of processes. default number of cpus')
+	parser.add_argument('--quiet', default=False, action='store_true', help='print only the summary')
+	args = parser.parse_args()
+
+	if not os.path.exists(args.path):
+		print('Specified path does not exist.')
+		exit(0)
+	validate(args.path, args.workers, print_errors=not args.quiet)